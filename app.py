@@ -11,6 +11,34 @@ import random
 import re
 import io
 import base64
+import urllib.error
+
+from corpus import DebateCorpus
+from inference_service import InferenceService
+from model_registry import (
+    MODEL_SIZES_MB,
+    SENTIMENT_MODEL,
+    ModelBudgetError,
+    ModelRegistry,
+    apply_precision,
+    pipeline_kwargs,
+    settings_from_env,
+)
+from ingest_server import DEFAULT_URL as DEFAULT_INGEST_URL, fetch_events, post_json
+from nlp_engine import (
+    extract_key_points,
+    extract_speaker_highlights,
+    score_sentiments,
+    transcript_hash,
+)
+from summary_planner import (
+    BART_MODEL,
+    DISTILBART_MODEL,
+    ThroughputTracker,
+    plan_summary,
+    run_summary_plan,
+)
+from transcript_parser import parse_transcript
 
 # Page configuration
 st.set_page_config(
@@ -53,91 +81,87 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Initialize models with lazy loading
-@st.cache_resource
-def load_summarizer():
-    """Load the summarization model with caching"""
-    return pipeline(
-    "summarization",
-    model="facebook/bart-large-cnn",
-        device=-1 if not torch.cuda.is_available() else 0
+# Model loaders - the model registry calls these on first use and after an unload
+def load_summarizer(model_name=BART_MODEL, precision="float32"):
+    """Load a summarization model"""
+    cuda_available = torch.cuda.is_available()
+    summarizer = pipeline(
+        "summarization",
+        model=model_name,
+        device=-1 if not cuda_available else 0,
+        **pipeline_kwargs(precision, cuda_available)
     )
+    return apply_precision(summarizer, precision, cuda_available)
 
-@st.cache_resource
-def load_sentiment_analyzer():
+def load_sentiment_analyzer(precision="float32"):
     """Load the sentiment analysis model"""
-    return pipeline(
+    cuda_available = torch.cuda.is_available()
+    analyzer = pipeline(
         "sentiment-analysis",
-        model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-        device=-1 if not torch.cuda.is_available() else 0
+        model=SENTIMENT_MODEL,
+        device=-1 if not cuda_available else 0,
+        **pipeline_kwargs(precision, cuda_available)
     )
+    return apply_precision(analyzer, precision, cuda_available)
 
-# Initialize models as None - will load when needed
-summarizer = None
-sentiment_analyzer = None
+# Most recent live statements kept in the dashboard
+LIVE_HISTORY = 5000
 
-def parse_transcript(text):
-    """Parse transcript text into structured format"""
-    lines = text.strip().split('\n')
-    parsed_data = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Try to match timestamp pattern [MM:SS] Speaker: Text
-        timestamp_match = re.match(r'\[(\d{1,2}:\d{2})\]\s*([^:]+):\s*(.+)', line)
-        if timestamp_match:
-            timestamp, speaker, text = timestamp_match.groups()
-            parsed_data.append({
-                "speaker": speaker.strip(),
-                "text": text.strip(),
-                "timestamp": timestamp,
-                "sentiment": "neutral"  # Will be updated by sentiment analysis
-            })
-        else:
-            # If no timestamp, try to match Speaker: Text pattern
-            speaker_match = re.match(r'([^:]+):\s*(.+)', line)
-            if speaker_match:
-                speaker, text = speaker_match.groups()
-                parsed_data.append({
-                    "speaker": speaker.strip(),
-                    "text": text.strip(),
-                    "timestamp": f"{len(parsed_data):02d}:00",  # Generate timestamp
-                    "sentiment": "neutral"
-                })
-    
-    return parsed_data
+# Transcript file types handled by the parser (caption files may not report a text/ MIME type)
+TRANSCRIPT_EXTENSIONS = ('.txt', '.srt', '.vtt')
+
+@st.cache_resource
+def get_throughput_tracker():
+    """Summary throughput measurements shared by all sessions"""
+    return ThroughputTracker()
+
+@st.cache_resource
+def get_model_registry():
+    """Loaded models shared by all sessions, kept within the configured memory budget"""
+    registry = ModelRegistry(**settings_from_env(torch.cuda.is_available()))
+    registry.register(SENTIMENT_MODEL, load_sentiment_analyzer, MODEL_SIZES_MB[SENTIMENT_MODEL])
+    for model_name in (BART_MODEL, DISTILBART_MODEL):
+        registry.register(
+            model_name,
+            lambda precision, model_name=model_name: load_summarizer(model_name, precision),
+            MODEL_SIZES_MB[model_name]
+        )
+    return registry
+
+@st.cache_resource
+def get_inference_service():
+    """Model service shared by all sessions; batches their requests together"""
+    return InferenceService(get_model_registry())
+
+def get_model_client(model_name, label):
+    """Return a pipeline-like client for a shared model, loading the model on first use"""
+    service = get_inference_service()
+    if not service.is_loaded(model_name):
+        with st.spinner(f"🤖 Loading {label} model..."):
+            try:
+                service.ensure_loaded(model_name)
+            except ModelBudgetError as error:
+                st.error(f"❌ Not enough model memory: {error}")
+                st.stop()
+    
+    return service.client(model_name)
+
+def get_sentiment_analyzer():
+    """Return the shared sentiment model client"""
+    return get_model_client(SENTIMENT_MODEL, "sentiment analysis")
+
+def get_summarizer(model_name=BART_MODEL):
+    """Return the shared summarization model client"""
+    return get_model_client(model_name, "summarization")
 
 def analyze_sentiment(text):
     """Analyze sentiment of text"""
-    global sentiment_analyzer
-    
-    # Load model only when needed
-    if sentiment_analyzer is None:
-        with st.spinner("🤖 Loading sentiment analysis model..."):
-            sentiment_analyzer = load_sentiment_analyzer()
-    
-    try:
-        result = sentiment_analyzer(text)
-        sentiment = result[0]['label'].lower()
-        confidence = result[0]['score']
-        
-        # Map sentiment labels
-        if 'positive' in sentiment or 'joy' in sentiment:
-            return 'positive'
-        elif 'negative' in sentiment or 'sad' in sentiment or 'anger' in sentiment:
-            return 'negative'
-        else:
-            return 'neutral'
-    except:
-        return 'neutral'
+    return score_sentiments([text], get_sentiment_analyzer())[0]
 
 def process_uploaded_file(uploaded_file):
     """Process uploaded file and extract transcript"""
-    if uploaded_file.type.startswith('text/'):
-        # Text file
+    if uploaded_file.type.startswith('text/') or uploaded_file.name.lower().endswith(TRANSCRIPT_EXTENSIONS):
+        # Text, SRT or WebVTT file
         content = str(uploaded_file.read(), "utf-8")
         return parse_transcript(content)
     else:
@@ -153,33 +177,14 @@ def process_manual_transcript(transcript_text, use_ai_sentiment=True):
     
     parsed_data = parse_transcript(transcript_text)
     
-    # Analyze sentiment for each entry
-    for entry in parsed_data:
-        if use_ai_sentiment:
-            entry['sentiment'] = analyze_sentiment(entry['text'])
-        else:
-            entry['sentiment'] = simple_sentiment_analysis(entry['text'])
+    # Analyze sentiment for all entries in one batched pass
+    analyzer = get_sentiment_analyzer() if use_ai_sentiment else None
+    sentiments = score_sentiments([entry['text'] for entry in parsed_data], analyzer)
+    for entry, sentiment in zip(parsed_data, sentiments):
+        entry['sentiment'] = sentiment
     
     return parsed_data
 
-def simple_sentiment_analysis(text):
-    """Simple keyword-based sentiment analysis"""
-    positive_words = ['good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 'positive', 'benefit', 'advantage', 'support', 'agree', 'yes', 'right', 'correct', 'true', 'clear', 'obvious', 'evidence', 'proven', 'success', 'win', 'victory', 'hope', 'future', 'progress', 'improve', 'better', 'best', 'love', 'like', 'enjoy', 'happy', 'pleased', 'satisfied', 'confident', 'sure', 'certain', 'definitely', 'absolutely', 'completely', 'totally', 'fully', 'strongly', 'firmly', 'clearly', 'obviously', 'undoubtedly', 'indeed', 'certainly', 'surely', 'definitely', 'absolutely', 'completely', 'totally', 'fully', 'strongly', 'firmly', 'clearly', 'obviously', 'undoubtedly', 'indeed', 'certainly', 'surely']
-    
-    negative_words = ['bad', 'terrible', 'awful', 'horrible', 'disgusting', 'negative', 'problem', 'issue', 'concern', 'worry', 'fear', 'danger', 'risk', 'threat', 'harm', 'damage', 'destruction', 'disaster', 'crisis', 'emergency', 'urgent', 'critical', 'serious', 'severe', 'extreme', 'worst', 'worst', 'hate', 'dislike', 'angry', 'frustrated', 'disappointed', 'sad', 'depressed', 'worried', 'anxious', 'nervous', 'scared', 'afraid', 'concerned', 'troubled', 'bothered', 'upset', 'annoyed', 'irritated', 'furious', 'outraged', 'disgusted', 'shocked', 'surprised', 'confused', 'lost', 'helpless', 'hopeless', 'desperate', 'despair', 'gloom', 'doom', 'pessimistic', 'cynical', 'skeptical', 'doubtful', 'uncertain', 'unsure', 'confused', 'lost', 'helpless', 'hopeless', 'desperate', 'despair', 'gloom', 'doom', 'pessimistic', 'cynical', 'skeptical', 'doubtful', 'uncertain', 'unsure']
-    
-    text_lower = text.lower()
-    
-    positive_count = sum(1 for word in positive_words if word in text_lower)
-    negative_count = sum(1 for word in negative_words if word in text_lower)
-    
-    if positive_count > negative_count:
-        return 'positive'
-    elif negative_count > positive_count:
-        return 'negative'
-    else:
-        return 'neutral'
-
 def generate_simple_summary(transcript_data):
     """Generate a simple summary without AI models"""
     if not transcript_data:
@@ -206,17 +211,88 @@ def generate_simple_summary(transcript_data):
         summary_parts.append("")
     
     # Add sentiment summary
+    summary_parts.extend(format_sentiment_breakdown(transcript_data))
+    
+    return "\n".join(summary_parts)
+
+def generate_extractive_summary(transcript_data, sentences_per_speaker=3):
+    """Generate a per-speaker summary from the most central sentences (TF-IDF ranked)"""
+    if not transcript_data:
+        return "No transcript data available for summary generation."
+    
+    highlights = extract_speaker_highlights(transcript_data, sentences_per_speaker)
+    return format_highlights_summary(highlights, transcript_data)
+
+def format_highlights_summary(highlights, transcript_data):
+    """Format per-speaker highlight sentences as a markdown summary"""
+    summary_parts = []
+    summary_parts.append("**Debate Summary:**")
+    summary_parts.append("")
+    
+    for speaker, sentences in highlights.items():
+        if not sentences:
+            continue
+        summary_parts.append(f"**{speaker}:**")
+        for i, sentence in enumerate(sentences, 1):
+            summary_parts.append(f"{i}. {sentence}")
+        summary_parts.append("")
+    
+    summary_parts.extend(format_sentiment_breakdown(transcript_data))
+    
+    return "\n".join(summary_parts)
+
+def format_sentiment_breakdown(transcript_data):
+    """Format sentiment counts as markdown lines for the summaries"""
     positive_count = sum(1 for entry in transcript_data if entry['sentiment'] == 'positive')
     negative_count = sum(1 for entry in transcript_data if entry['sentiment'] == 'negative')
     neutral_count = sum(1 for entry in transcript_data if entry['sentiment'] == 'neutral')
     
     total = len(transcript_data)
-    summary_parts.append("**Sentiment Analysis:**")
-    summary_parts.append(f"- Positive statements: {positive_count} ({positive_count/total*100:.1f}%)")
-    summary_parts.append(f"- Negative statements: {negative_count} ({negative_count/total*100:.1f}%)")
-    summary_parts.append(f"- Neutral statements: {neutral_count} ({neutral_count/total*100:.1f}%)")
+    return [
+        "**Sentiment Analysis:**",
+        f"- Positive statements: {positive_count} ({positive_count/total*100:.1f}%)",
+        f"- Negative statements: {negative_count} ({negative_count/total*100:.1f}%)",
+        f"- Neutral statements: {neutral_count} ({neutral_count/total*100:.1f}%)",
+    ]
+
+@st.cache_data(max_entries=32)
+def get_key_points(transcript_key, _transcript_data):
+    """Extract key points once per transcript, keyed by its content hash"""
+    return extract_key_points(_transcript_data)
+
+def pull_live_transcript(ingest_url):
+    """Append newly scored lines from the ingest server to this session's live transcript"""
+    if 'live_transcript' not in st.session_state:
+        st.session_state.live_transcript = []
+        st.session_state.live_seq = 0
     
-    return "\n".join(summary_parts)
+    try:
+        payload = fetch_events(ingest_url, st.session_state.live_seq)
+    except (urllib.error.URLError, OSError):
+        st.warning(f"📡 Ingest server not reachable at {ingest_url}. Start it with `python ingest_server.py`.")
+        return st.session_state.live_transcript
+    
+    for event in payload["events"]:
+        st.session_state.live_transcript.append({
+            "speaker": event["speaker"],
+            "text": event["text"],
+            "timestamp": event["timestamp"],
+            "sentiment": event["sentiment"]
+        })
+    del st.session_state.live_transcript[:-LIVE_HISTORY]
+    st.session_state.live_seq = payload["last_seq"]
+    
+    return st.session_state.live_transcript
+
+def acknowledge_live_render(ingest_url):
+    """Tell the ingest server which lines are now on screen, for end-to-end latency"""
+    seq = st.session_state.get('live_seq', 0)
+    if seq > st.session_state.get('live_acked_seq', 0):
+        try:
+            post_json(ingest_url, "/ack", {"seq": seq, "rendered_at": time.time()})
+            st.session_state.live_acked_seq = seq
+        except (urllib.error.URLError, OSError):
+            pass
 
 def generate_sentiment_timeline(transcript_data):
     """Generate sentiment timeline data from transcript"""
@@ -310,8 +386,8 @@ def main():
         # File upload
         uploaded_file = st.file_uploader(
             "Upload Debate Audio/Video",
-            type=['mp3', 'mp4', 'wav', 'txt'],
-            help="Upload audio, video, or transcript files"
+            type=['mp3', 'mp4', 'wav', 'txt', 'srt', 'vtt'],
+            help="Upload audio, video, or transcript (TXT, SRT, WebVTT) files"
         )
         
         # Manual transcript input
@@ -333,6 +409,8 @@ def main():
             Prof. Rodriguez: While I acknowledge the climate data...
             Dr. Sarah Chen: The economic cost of inaction far exceeds...
             ```
+            
+            Timestamps may include hours (`[1:02:03]`), and lines without a speaker continue the previous statement. SRT and WebVTT caption files are detected automatically.
             """)
         
         manual_transcript = st.text_area(
@@ -353,19 +431,60 @@ def main():
         
         analyze_sentiment = st.checkbox("Sentiment Analysis", value=True)
         generate_summary = st.checkbox("Generate Summary", value=True)
+        summary_engine = st.selectbox(
+            "Summary Engine",
+            ["⚡ Extractive (fast)", "⏱️ Auto (latency budget)", "🤖 AI (BART)", "📝 Simple"],
+            help="Extractive ranks the most representative sentences per speaker in well under a second. Auto picks the best summary that fits your time budget. AI runs the BART model and can take much longer on CPU."
+        )
+        if summary_engine == "⏱️ Auto (latency budget)":
+            latency_budget = st.slider(
+                "Summary time budget (seconds)",
+                min_value=1,
+                max_value=120,
+                value=3,
+                help="Auto chooses between extractive and abstractive summaries, the model, beam count and input length from the transcript size and measured speed"
+            )
             
         show_timeline = st.checkbox("Show Timeline", value=True)
         
         # Real-time toggle
         real_time = st.toggle("Real-time Analysis", value=False)
         
+        # Shared model service health
+        service_stats = {name: stats for name, stats in get_inference_service().stats().items() if stats["loads"]}
+        if service_stats:
+            with st.expander("⚙️ Inference Service"):
+                registry = get_model_registry()
+                budget = f" of {registry.budget_mb:.0f} MB" if registry.budget_mb else ""
+                st.caption(f"Model memory: {registry.resident_mb():.0f} MB{budget} ({registry.precision})")
+                for name, stats in service_stats.items():
+                    st.markdown(f"**{name.split('/')[-1]}**")
+                    queue_times = stats["queue"]
+                    compute_times = stats["compute"]
+                    if not stats["loaded"]:
+                        st.caption(
+                            f"Unloaded to save memory · reloads on next use "
+                            f"({stats['loads']} loads, {stats['evictions']} evictions)"
+                        )
+                    elif queue_times:
+                        st.caption(
+                            f"{stats['batches']} batches (avg {stats['mean_batch_inputs']:.1f} inputs) · "
+                            f"queue p50 {queue_times['p50'] * 1000:.0f}ms / p95 {queue_times['p95'] * 1000:.0f}ms · "
+                            f"compute p50 {compute_times['p50'] * 1000:.0f}ms / p95 {compute_times['p95'] * 1000:.0f}ms · "
+                            f"{stats['waiting']} waiting · {stats['size_mb']:.0f} MB"
+                        )
+                    else:
+                        st.caption("Loaded, no requests yet")
+        
         if real_time:
             st.success("🟢 Live analysis active")
+            ingest_url = st.text_input("Ingest server", value=DEFAULT_INGEST_URL, help="Lines posted to this server's /lines endpoint appear here as they are scored")
+            live_refresh = st.slider("Refresh every (seconds)", min_value=1, max_value=10, value=2)
         else:
             st.info("⏸️ Analysis paused")
     
     # Main content tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Dashboard", "📝 Transcript", "📈 Sentiment", "🗳️ Voting", "📋 Summary"])
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["📊 Dashboard", "📝 Transcript", "📈 Sentiment", "🗳️ Voting", "📋 Summary", "📚 Corpus"])
     
     # Process input data
     transcript_data = None
@@ -390,6 +509,12 @@ def main():
                 st.warning("⚠️ Please upload a file or enter a transcript to analyze.")
                 transcript_data = None
     
+    # Live lines from the ingest server take over while real-time analysis is on
+    if real_time:
+        live_transcript = pull_live_transcript(ingest_url)
+        if live_transcript:
+            transcript_data = live_transcript
+    
     # Use processed data or fall back to sample data
     if transcript_data:
         sentiment_data = generate_sentiment_timeline(transcript_data)
@@ -653,27 +778,70 @@ def main():
         
         # Generate summary
         if generate_summary:
-            if analyze_sentiment:  # Use AI if sentiment analysis is enabled
-                global summarizer
+            if summary_engine == "⚡ Extractive (fast)":
+                with st.spinner("⚡ Ranking key sentences..."):
+                    summary_text = generate_extractive_summary(data["transcript"])
+                    st.success("✅ Extractive summary generated successfully!")
+                    
+                    # Display summary
+                    st.subheader("📝 Extractive Executive Summary")
+                    st.markdown(summary_text)
+            elif summary_engine == "⏱️ Auto (latency budget)":
+                tracker = get_throughput_tracker()
+                plan = plan_summary(data["transcript"], latency_budget, tracker, loaded_models=get_inference_service().loaded_models())
+                
+                with st.spinner("⏱️ Generating summary within budget..."):
+                    try:
+                        summary, report = run_summary_plan(plan, data["transcript"], get_summarizer, tracker)
+                    except ModelBudgetError as error:
+                        # The model can be evicted and fail to reload after get_summarizer() loaded it
+                        report = None
+                        st.error(f"❌ Not enough model memory: {error}")
+                
+                if report is not None:
+                    elapsed = report["elapsed_seconds"]
+                    if elapsed <= latency_budget:
+                        st.success(f"✅ Summary generated in {elapsed:.2f}s of your {latency_budget}s budget")
+                    else:
+                        st.warning(f"⚠️ Summary took {elapsed:.2f}s, over your {latency_budget}s budget")
                 
-                # Load model only when needed
-                if summarizer is None:
-                    with st.spinner("🤖 Loading summarization model..."):
-                        summarizer = load_summarizer()
+                    if plan["strategy"] == "abstractive":
+                        model_label = "DistilBART" if plan["model"] == DISTILBART_MODEL else "BART"
+                        input_label = f"top {plan['input_words']} of {plan['total_words']} words" if plan["condensed"] else f"all {plan['total_words']} words"
+                        st.caption(f"Strategy: abstractive ({model_label}, {plan['num_beams']} beam(s), {input_label}) · estimated {plan['estimated_seconds']:.2f}s · model load {report['load_seconds']:.2f}s")
+                    
+                        st.subheader("📝 AI-Generated Executive Summary")
+                        st.write(summary)
+                    else:
+                        st.caption(f"Strategy: extractive ({plan['total_words']} words) · estimated {plan['estimated_seconds']:.2f}s")
+                    
+                        st.subheader("📝 Extractive Executive Summary")
+                        st.markdown(format_highlights_summary(summary, data["transcript"]))
+            elif summary_engine == "🤖 AI (BART)":
+                summarizer = get_summarizer(BART_MODEL)
                 
                 with st.spinner("🤖 Generating AI summary..."):
                     # Combine all transcript text
                     full_text = " ".join([entry["text"] for entry in data["transcript"]])
                     
                     # Generate summary
-                    summary_result = summarizer(full_text, max_length=150, min_length=50, do_sample=False)
-                    summary_text = summary_result[0]['summary_text']
-                    
-                    st.success("✅ AI Summary generated successfully!")
+                    try:
+                        summary_result = summarizer(full_text, max_length=150, min_length=50, do_sample=False, truncation=True)
+                    except ModelBudgetError as error:
+                        # The model can be evicted and fail to reload after get_summarizer() loaded it
+                        summary_result = None
+                        st.error(f"❌ Not enough model memory: {error}")
                     
-                    # Display summary
-                    st.subheader("📝 AI-Generated Executive Summary")
-                    st.write(summary_text)
+                    if summary_result is not None:
+                        summary_text = summary_result[0]['summary_text']
+                        timing = summarizer.last_result
+                        
+                        st.success("✅ AI Summary generated successfully!")
+                        st.caption(f"Queued {timing.queue_seconds:.2f}s · compute {timing.compute_seconds:.2f}s · batch of {timing.batch_requests} request(s)")
+                        
+                        # Display summary
+                        st.subheader("📝 AI-Generated Executive Summary")
+                        st.write(summary_text)
             else:
                 # Use simple summary generation
                 with st.spinner("📝 Generating summary..."):
@@ -687,16 +855,14 @@ def main():
         # Key points extraction
         st.subheader("🎯 Key Discussion Points")
         
-        key_points = [
-            "Scientific consensus on climate urgency vs economic concerns",
-            "Debate over job creation vs job displacement",
-            "Discussion of carbon tax effectiveness",
-            "Balancing environmental and economic priorities",
-            "Evidence of climate change economic costs"
-        ]
+        key_points = get_key_points(transcript_hash(data["transcript"]), data["transcript"])
         
-        for i, point in enumerate(key_points, 1):
-            st.write(f"{i}. {point}")
+        if key_points:
+            for i, point in enumerate(key_points, 1):
+                statements = "statement" if point["statements"] == 1 else "statements"
+                st.write(f"{i}. **{point['phrase'].capitalize()}** — {point['statements']} {statements} ({', '.join(point['speakers'])})")
+        else:
+            st.info("No recurring key phrases found in this transcript.")
         
         # Speaker analysis
         st.subheader("👥 Speaker Analysis")
@@ -753,5 +919,94 @@ def main():
             if st.button("📋 Export Summary"):
                 st.success("Summary exported successfully!")
 
+    with tab6:
+        st.header("📚 Debate Corpus")
+        st.caption("Compare speakers, sentiment and topics across a season of debates. Name files with a date (e.g. `2024-03-14-town-hall.txt`) to plot them over time.")
+        
+        if 'corpus' not in st.session_state:
+            st.session_state.corpus = DebateCorpus()
+            # Bumped on clear so the uploader comes back empty instead of re-adding its files
+            st.session_state.corpus_uploader = 0
+        corpus = st.session_state.corpus
+        
+        corpus_files = st.file_uploader(
+            "Upload debate transcripts",
+            type=['txt', 'srt', 'vtt'],
+            accept_multiple_files=True,
+            key=f"corpus_files_{st.session_state.corpus_uploader}",
+            help="Only debates not yet in the corpus are analyzed; existing results are kept"
+        )
+        
+        new_files = [file for file in corpus_files or [] if file.name not in corpus]
+        if new_files:
+            with st.spinner(f"🔄 Adding {len(new_files)} debate(s) to the corpus..."):
+                corpus.add_debates(
+                    [{"debate_id": file.name, "text": str(file.read(), "utf-8")} for file in new_files],
+                    analyzer=get_sentiment_analyzer() if analyze_sentiment else None
+                )
+            st.success(f"✅ Added {len(new_files)} debate(s) to the corpus!")
+        
+        if len(corpus) == 0:
+            st.info("📂 Upload one or more transcripts to build a corpus.")
+        else:
+            share = corpus.speaking_share()
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Debates", len(corpus))
+            with col2:
+                st.metric("Statements", int(corpus.debates["statements"].sum()))
+            with col3:
+                st.metric("Speakers", len(share))
+            
+            # Per-speaker sentiment over time
+            st.subheader("📈 Speaker Sentiment Over Time")
+            timeline_df = corpus.speaker_sentiment_over_time()
+            x_axis = "date" if timeline_df["date"].notna().all() else "order"
+            fig_corpus = px.line(
+                timeline_df,
+                x=x_axis,
+                y="polarity",
+                color="speaker",
+                markers=True,
+                hover_data=["title", "statements"],
+                labels={"polarity": "Mean sentiment (-1 to +1)", "order": "Debate", "date": "Date"}
+            )
+            st.plotly_chart(fig_corpus, use_container_width=True)
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.subheader("🗣️ Speaking Share")
+                fig_share = px.pie(share, values="words", names="speaker")
+                st.plotly_chart(fig_share, use_container_width=True)
+            
+            with col2:
+                st.subheader("🏷️ Topic Frequency")
+                topics_df = corpus.topic_frequency()
+                fig_topics = px.bar(
+                    topics_df,
+                    x="debates",
+                    y="phrase",
+                    orientation="h",
+                    hover_data=["statements"],
+                    labels={"debates": "Debates", "phrase": "Topic"}
+                )
+                fig_topics.update_layout(yaxis={"categoryorder": "total ascending"})
+                st.plotly_chart(fig_topics, use_container_width=True)
+            
+            st.dataframe(share, use_container_width=True)
+            
+            if st.button("🗑️ Clear Corpus"):
+                st.session_state.corpus = DebateCorpus()
+                st.session_state.corpus_uploader += 1
+                st.rerun()
+    
+    # Keep polling the ingest server while real-time analysis is on
+    if real_time:
+        acknowledge_live_render(ingest_url)
+        time.sleep(live_refresh)
+        st.rerun()
+
 if __name__ == "__main__":
     main()
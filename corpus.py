@@ -0,0 +1,179 @@
+"""
+DebatePulse - corpus analytics
+Aggregates speakers, sentiment and topics across many debates
+"""
+
+import re
+
+import pandas as pd
+
+from nlp_engine import extract_key_points, score_sentiments
+from transcript_parser import parse_transcript
+
+# Sentiment labels as signed scores for averaging
+SENTIMENT_POLARITY = {"positive": 1, "neutral": 0, "negative": -1}
+
+# Topics recorded per debate; corpus topic frequency is built from these
+TOPICS_PER_DEBATE = 10
+
+DATE_IN_NAME = re.compile(r'(\d{4})[-_.](\d{2})[-_.](\d{2})')
+
+
+def date_from_name(name):
+    """Read a YYYY-MM-DD date out of a debate file name, if it has one"""
+    match = DATE_IN_NAME.search(name)
+    if not match:
+        return pd.NaT
+    return pd.to_datetime("-".join(match.groups()), errors='coerce')
+
+
+class DebateCorpus:
+    """Statements and cross-debate aggregates for a season of debates
+
+    Each debate's per-speaker and per-topic tables are computed once when it is
+    added and appended to the corpus tables, so adding a debate never rescans
+    the statements of the debates already loaded.
+    """
+
+    def __init__(self):
+        self.debates = pd.DataFrame(columns=["debate_id", "title", "date", "order", "statements"])
+        self.speaker_stats = pd.DataFrame(columns=[
+            "debate_id", "speaker", "statements", "words",
+            "positive", "negative", "neutral", "polarity"
+        ])
+        self.topics = pd.DataFrame(columns=["debate_id", "phrase", "statements"])
+        self._next_order = 0
+
+    def __contains__(self, debate_id):
+        return debate_id in set(self.debates["debate_id"])
+
+    def __len__(self):
+        return len(self.debates)
+
+    def add_debates(self, debates, analyzer=None, batch_size=32):
+        """Add several debates, scoring their statements in one batched pass
+
+        `debates` is an iterable of dicts with a `debate_id` and either `text`
+        (raw transcript) or `transcript` (already parsed and scored), plus
+        optional `title` and `date`. A debate whose id is already in the corpus,
+        or appears again later in `debates`, replaces the earlier one.
+        """
+        # Within one call too, a later debate replaces an earlier one with the same id
+        latest = {}
+        for debate in debates:
+            latest.pop(debate["debate_id"], None)
+            latest[debate["debate_id"]] = debate
+
+        prepared = []
+        pending = []
+        for debate in latest.values():
+            transcript = debate.get("transcript")
+            if transcript is None:
+                transcript = parse_transcript(debate.get("text", ""))
+                pending.extend(transcript)
+            prepared.append((debate, transcript))
+        if not prepared:
+            return
+
+        sentiments = score_sentiments([entry["text"] for entry in pending], analyzer, batch_size)
+        for entry, sentiment in zip(pending, sentiments):
+            entry["sentiment"] = sentiment
+
+        for debate, _ in prepared:
+            if debate["debate_id"] in self:
+                self.remove_debate(debate["debate_id"])
+
+        debate_rows = []
+        statement_frames = []
+        topic_rows = []
+        for debate, transcript in prepared:
+            debate_id = debate["debate_id"]
+            date = debate.get("date")
+            debate_rows.append({
+                "debate_id": debate_id,
+                "title": debate.get("title") or debate_id,
+                "date": date_from_name(debate_id) if date is None else pd.to_datetime(date),
+                "order": self._next_order,
+                "statements": len(transcript)
+            })
+            self._next_order += 1
+
+            frame = pd.DataFrame(transcript, columns=["speaker", "text", "sentiment"])
+            frame["debate_id"] = debate_id
+            statement_frames.append(frame)
+
+            topic_rows.extend(
+                {"debate_id": debate_id, "phrase": point["phrase"], "statements": point["statements"]}
+                for point in extract_key_points(transcript, TOPICS_PER_DEBATE)
+            )
+
+        # One group-by over every new statement, keyed by (debate, speaker)
+        statements = pd.concat(statement_frames, ignore_index=True)
+        statements["words"] = statements["text"].str.split().str.len().fillna(0).astype(int)
+        statements["polarity"] = statements["sentiment"].map(SENTIMENT_POLARITY).fillna(0)
+        for sentiment in ("positive", "negative", "neutral"):
+            statements[sentiment] = (statements["sentiment"] == sentiment).astype(int)
+
+        speaker_part = statements.groupby(["debate_id", "speaker"], sort=False).agg(
+            statements=("text", "size"),
+            words=("words", "sum"),
+            positive=("positive", "sum"),
+            negative=("negative", "sum"),
+            neutral=("neutral", "sum"),
+            polarity=("polarity", "mean")
+        ).reset_index()
+
+        self.debates = _append(self.debates, pd.DataFrame(debate_rows))
+        self.speaker_stats = _append(self.speaker_stats, speaker_part[self.speaker_stats.columns])
+        self.topics = _append(self.topics, pd.DataFrame(topic_rows, columns=self.topics.columns))
+
+    def add_debate(self, debate_id, transcript_data, title=None, date=None):
+        """Add one already-scored debate"""
+        self.add_debates([{
+            "debate_id": debate_id,
+            "transcript": transcript_data,
+            "title": title,
+            "date": date
+        }])
+
+    def remove_debate(self, debate_id):
+        """Drop a debate and its contribution to every aggregate"""
+        self.debates = self.debates[self.debates["debate_id"] != debate_id]
+        self.speaker_stats = self.speaker_stats[self.speaker_stats["debate_id"] != debate_id]
+        self.topics = self.topics[self.topics["debate_id"] != debate_id]
+
+    def speaker_sentiment_over_time(self):
+        """Mean sentiment polarity of each speaker in each debate, in debate order"""
+        timeline = self.speaker_stats.merge(
+            self.debates[["debate_id", "title", "date", "order"]], on="debate_id"
+        )
+        return timeline.sort_values(["order", "speaker"]).reset_index(drop=True)
+
+    def topic_frequency(self, top_n=15):
+        """How many debates raised each topic and how many statements mention it"""
+        frequency = self.topics.groupby("phrase").agg(
+            debates=("debate_id", "nunique"),
+            statements=("statements", "sum")
+        )
+        return frequency.sort_values(["debates", "statements"], ascending=False).head(top_n).reset_index()
+
+    def speaking_share(self):
+        """Each speaker's share of all words spoken across the corpus"""
+        totals = self.speaker_stats.groupby("speaker").agg(
+            debates=("debate_id", "nunique"),
+            statements=("statements", "sum"),
+            words=("words", "sum"),
+            positive=("positive", "sum"),
+            negative=("negative", "sum"),
+            neutral=("neutral", "sum")
+        )
+        total_words = totals["words"].sum()
+        totals["share"] = totals["words"] / total_words if total_words else 0.0
+        return totals.sort_values("words", ascending=False).reset_index()
+
+
+def _append(table, part):
+    """Append rows to a corpus table; an empty table is replaced so the new rows set the dtypes"""
+    if table.empty:
+        return part.reset_index(drop=True)
+    return pd.concat([table, part], ignore_index=True)
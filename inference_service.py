@@ -0,0 +1,211 @@
+"""
+DebatePulse - shared inference service
+One worker per model coalesces requests from every session into batches
+"""
+
+import collections
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+
+from metrics import percentiles
+
+# How long a worker waits for more requests to join a batch
+DEFAULT_BATCH_WINDOW = 0.01
+
+# Largest number of inputs run through a model in one call
+DEFAULT_MAX_BATCH = 32
+
+# Timings kept per model for stats()
+TIMING_HISTORY = 1000
+
+
+class InferenceResult:
+    """Outputs of one request plus how long it queued and computed"""
+
+    def __init__(self, outputs, queue_seconds, compute_seconds, batch_requests, batch_inputs):
+        self.outputs = outputs
+        self.queue_seconds = queue_seconds
+        self.compute_seconds = compute_seconds
+        self.batch_requests = batch_requests
+        self.batch_inputs = batch_inputs
+
+
+class _Request:
+    def __init__(self, inputs, options):
+        self.inputs = inputs
+        self.options = options
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class _ModelWorker:
+    """Serves one model; only its thread ever calls the model"""
+
+    def __init__(self, name, registry, max_batch, window):
+        self.name = name
+        self.registry = registry
+        self.max_batch = max_batch
+        self.window = window
+        self.requests = queue.Queue()
+        self.deferred = collections.deque()
+        self.queue_times = collections.deque(maxlen=TIMING_HISTORY)
+        self.compute_times = collections.deque(maxlen=TIMING_HISTORY)
+        self.batch_sizes = collections.deque(maxlen=TIMING_HISTORY)
+        self.thread = threading.Thread(target=self._run, name=f"inference-{name}", daemon=True)
+        self.thread.start()
+
+    def _next_request(self, timeout=None):
+        if self.deferred:
+            return self.deferred.popleft()
+        return self.requests.get(timeout=timeout)
+
+    def _collect_batch(self):
+        """Wait for a request, then gather compatible ones for up to `window` seconds"""
+        first = self._next_request()
+        batch = [first]
+        size = len(first.inputs)
+        skipped = []
+        deadline = time.perf_counter() + self.window
+
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 and not self.deferred:
+                break
+            try:
+                request = self._next_request(timeout=max(remaining, 0))
+            except queue.Empty:
+                break
+            if request.options != first.options or size + len(request.inputs) > self.max_batch:
+                # Different generation settings or no room: run it in a later batch
+                skipped.append(request)
+                continue
+            batch.append(request)
+            size += len(request.inputs)
+
+        self.deferred.extendleft(reversed(skipped))
+        return batch
+
+    def _infer(self, inputs, options):
+        """Run one batch; returns (outputs, compute start time)
+
+        The model is only referenced inside this call, so once it returns an
+        unload by the registry really frees the model's memory.
+        """
+        # The registry loads the model if it was evicted and keeps it while in use
+        with self.registry.acquire(self.name) as model:
+            started = time.perf_counter()
+            # One oversized request still runs through the model max_batch inputs at a time
+            return model(inputs, batch_size=min(len(inputs), self.max_batch), **dict(options)), started
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            inputs = [text for request in batch for text in request.inputs]
+            try:
+                outputs, started = self._infer(inputs, batch[0].options)
+            except Exception as error:
+                # The traceback's frames would otherwise keep the model alive
+                # for as long as a caller holds the exception
+                traceback.clear_frames(error.__traceback__)
+                for request in batch:
+                    request.future.set_exception(error)
+                continue
+            finished = time.perf_counter()
+
+            compute_seconds = finished - started
+            self.compute_times.append(compute_seconds)
+            self.batch_sizes.append(len(inputs))
+            position = 0
+            for request in batch:
+                count = len(request.inputs)
+                queue_seconds = started - request.enqueued_at
+                self.queue_times.append(queue_seconds)
+                request.future.set_result(InferenceResult(
+                    outputs[position:position + count],
+                    queue_seconds,
+                    compute_seconds,
+                    len(batch),
+                    len(inputs)
+                ))
+                position += count
+
+
+class InferenceService:
+    """In-process model server shared by all Streamlit sessions
+
+    Serves every model registered in a ModelRegistry, which decides when
+    models are loaded and unloaded. Requests for the same model that arrive
+    within `window` seconds of each other (and use the same options) run as
+    one batch. Each model is called only from its own worker thread, so
+    sessions never use a model concurrently.
+    """
+
+    def __init__(self, registry, max_batch=DEFAULT_MAX_BATCH, window=DEFAULT_BATCH_WINDOW):
+        self.registry = registry
+        self._workers = {
+            name: _ModelWorker(name, registry, max_batch, window)
+            for name in registry.names()
+        }
+
+    def submit(self, model, inputs, **options):
+        """Queue inputs for a model; returns a Future of an InferenceResult"""
+        request = _Request(list(inputs), tuple(sorted(options.items())))
+        self._workers[model].requests.put(request)
+        return request.future
+
+    def ensure_loaded(self, model):
+        """Load a model now instead of on its first request"""
+        self.registry.load(model)
+
+    def is_loaded(self, model):
+        return self.registry.is_loaded(model)
+
+    def loaded_models(self):
+        return self.registry.loaded_models()
+
+    def client(self, model):
+        """Pipeline-like callable for a model, usable wherever a transformers pipeline is"""
+        return ModelClient(self, model)
+
+    def stats(self):
+        """Per-model memory state plus queue/compute percentiles (seconds), batch sizes and backlog"""
+        report = self.registry.stats()
+        for name, worker in self._workers.items():
+            batch_sizes = list(worker.batch_sizes)
+            report[name].update({
+                "waiting": worker.requests.qsize() + len(worker.deferred),
+                "batches": len(batch_sizes),
+                "mean_batch_inputs": sum(batch_sizes) / len(batch_sizes) if batch_sizes else 0.0,
+                "queue": percentiles(list(worker.queue_times)),
+                "compute": percentiles(list(worker.compute_times)),
+            })
+        return report
+
+
+class ModelClient:
+    """Callable handle that sends pipeline calls through an InferenceService
+
+    Behaves like the transformers pipeline for a string or list of strings.
+    The timing of the calling thread's last request is kept in `last_result`.
+    """
+
+    def __init__(self, service, model):
+        self.service = service
+        self.model = model
+        self._local = threading.local()
+
+    @property
+    def last_result(self):
+        return getattr(self._local, "result", None)
+
+    def __call__(self, inputs, **options):
+        # The service decides batch sizes, at most its max_batch per model call
+        options.pop("batch_size", None)
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        result = self.service.submit(self.model, inputs, **options).result()
+        self._local.result = result
+        return result.outputs
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+DebatePulse - live ingest server
+Accepts transcript lines over HTTP and micro-batches them into sentiment scoring
+
+Endpoints:
+    POST /lines   - JSON {"lines": [...], "sent_at": <epoch>} or newline-separated text
+    GET  /events  - scored lines after ?since=<seq>, long-polling up to ?timeout=<s>
+    POST /ack     - JSON {"seq": <seq>, "rendered_at": <epoch>} from a dashboard
+    GET  /stats   - queue depth, batching and latency percentiles
+    GET  /health
+"""
+
+import argparse
+import collections
+import json
+import math
+import queue
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from metrics import percentiles
+from nlp_engine import score_sentiments
+from transcript_parser import LINE, UNKNOWN_SPEAKER, parse_transcript
+
+DEFAULT_PORT = 8765
+DEFAULT_URL = f"http://localhost:{DEFAULT_PORT}"
+
+# Longest a client may hold a /events request open
+MAX_POLL_SECONDS = 30.0
+
+
+class IngestPipeline:
+    """Bounded queue of incoming lines scored in micro-batches by one worker thread
+
+    Lines wait in a queue of at most `max_queue` entries; when it is full new
+    lines are rejected so the sender can back off. The worker takes up to
+    `batch_size` lines, waiting at most `max_wait` seconds to fill a batch,
+    and scores them in one call. Scored lines are kept in a bounded history
+    that subscribers read by sequence number.
+    """
+
+    def __init__(self, analyzer=None, max_queue=1000, batch_size=32, max_wait=0.05, history=10000):
+        self.analyzer = analyzer
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._events = collections.deque(maxlen=history)
+        self._changed = threading.Condition()
+        self._last_seq = 0
+        self._last_speaker = UNKNOWN_SPEAKER
+        # Timestamp from a bare "[00:10]" line, applied to the next statement
+        self._pending_stamp = ""
+        self._acked_seq = 0
+
+        self.accepted = 0
+        self.rejected = 0
+        self.failed = 0
+        self.batches = 0
+        self._score_latencies = collections.deque(maxlen=history)
+        self._end_to_end_latencies = collections.deque(maxlen=history)
+
+        self._worker = threading.Thread(target=self._run, name="ingest-worker", daemon=True)
+        self._worker.start()
+
+    def offer(self, lines, sent_at=None):
+        """Queue lines without blocking; returns how many were accepted
+
+        An item containing newlines is queued as one line per statement.
+        """
+        received_at = time.time()
+        lines = split_lines(lines)
+        accepted = 0
+        for line in lines:
+            try:
+                self._queue.put_nowait((line, received_at, sent_at))
+            except queue.Full:
+                break
+            accepted += 1
+
+        with self._changed:
+            self.accepted += accepted
+            self.rejected += len(lines) - accepted
+        return accepted
+
+    def events_since(self, seq, timeout=0.0):
+        """Scored lines with a sequence number above `seq`, waiting up to `timeout` for new ones"""
+        deadline = time.monotonic() + min(timeout, MAX_POLL_SECONDS)
+        with self._changed:
+            while self._last_seq <= seq:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+            return [event for event in self._events if event["seq"] > seq], self._last_seq
+
+    def ack(self, seq, rendered_at=None):
+        """Record that a dashboard has drawn every line up to `seq`"""
+        rendered_at = rendered_at or time.time()
+        with self._changed:
+            for event in self._events:
+                if self._acked_seq < event["seq"] <= seq:
+                    self._end_to_end_latencies.append(rendered_at - event["received_at"])
+            self._acked_seq = max(self._acked_seq, seq)
+
+    def stats(self):
+        """Counters and latency percentiles (seconds) for monitoring and load tests"""
+        with self._changed:
+            score_latencies = list(self._score_latencies)
+            end_to_end = list(self._end_to_end_latencies)
+            last_seq = self._last_seq
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "scored": last_seq,
+            "batches": self.batches,
+            "mean_batch_size": last_seq / self.batches if self.batches else 0.0,
+            "arrival_to_scored": percentiles(score_latencies),
+            "arrival_to_rendered": percentiles(end_to_end),
+        }
+
+    def _next_batch(self):
+        """Block for one line, then gather more until the batch is full or max_wait passes"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """Worker loop: parse, score and publish one micro-batch at a time"""
+        while True:
+            batch = self._next_batch()
+            try:
+                self._process(batch)
+            except Exception as error:
+                # Drop the batch but keep the worker alive for the lines behind it
+                with self._changed:
+                    self.failed += len(batch)
+                print(f"⚠️ Failed to score {len(batch)} line(s): {error!r}")
+
+    def _process(self, batch):
+        """Parse, score and publish one micro-batch"""
+        entries = []
+        for line, received_at, sent_at in batch:
+            parsed = parse_transcript(line, 'lines')
+            if parsed:
+                entry = parsed[0]
+                if entry["speaker"] == UNKNOWN_SPEAKER:
+                    entry["speaker"] = self._last_speaker
+            else:
+                stamp, _, text = LINE.match(line).groups()
+                if stamp and not text:
+                    # A timestamp on its own line times the statement that follows
+                    self._pending_stamp = stamp
+                    continue
+                # A bare line continues the current speaker
+                entry = {"speaker": self._last_speaker, "text": line, "timestamp": ""}
+            if self._pending_stamp:
+                entry["timestamp"] = entry["timestamp"] or self._pending_stamp
+                self._pending_stamp = ""
+            self._last_speaker = entry["speaker"]
+            entry["received_at"] = received_at
+            entry["sent_at"] = sent_at
+            entries.append(entry)
+        if not entries:
+            return
+
+        sentiments = score_sentiments([entry["text"] for entry in entries], self.analyzer, self.batch_size)
+        scored_at = time.time()
+
+        with self._changed:
+            for entry, sentiment in zip(entries, sentiments):
+                self._last_seq += 1
+                entry["seq"] = self._last_seq
+                entry["sentiment"] = sentiment
+                entry["scored_at"] = scored_at
+                self._events.append(entry)
+                self._score_latencies.append(scored_at - entry["received_at"])
+            self.batches += 1
+            self._changed.notify_all()
+
+
+class IngestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of an IngestPipeline (set as the server's `pipeline`)"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        pipeline = self.server.pipeline
+
+        if url.path == "/events":
+            try:
+                since = int(params.get("since", ["0"])[0])
+                timeout = float(params.get("timeout", ["0"])[0])
+                if not math.isfinite(timeout):
+                    raise ValueError(timeout)
+            except ValueError:
+                self._send_json(400, {"error": "since must be an integer and timeout a number"})
+                return
+            events, last_seq = pipeline.events_since(since, timeout)
+            self._send_json(200, {"events": events, "last_seq": last_seq})
+        elif url.path == "/stats":
+            self._send_json(200, pipeline.stats())
+        elif url.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        pipeline = self.server.pipeline
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length).decode("utf-8")
+        except (ValueError, UnicodeDecodeError):
+            self._send_json(400, {"error": "body must be UTF-8 with a valid Content-Length"})
+            return
+
+        try:
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                payload = json.loads(body or "{}")
+            else:
+                payload = {"lines": body.split("\n")}
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": "invalid JSON"})
+            return
+        if not isinstance(payload, dict):
+            self._send_json(400, {"error": "JSON body must be an object"})
+            return
+
+        if url.path == "/lines":
+            lines = payload.get("lines", [])
+            sent_at = payload.get("sent_at")
+            if isinstance(lines, str):
+                # A single line sent as a string
+                lines = [lines]
+            if not isinstance(lines, list) or not all(isinstance(line, str) for line in lines):
+                self._send_json(400, {"error": "lines must be a string or a list of strings"})
+                return
+            if not _is_number(sent_at, optional=True):
+                self._send_json(400, {"error": "sent_at must be a number"})
+                return
+            accepted = pipeline.offer(lines, sent_at)
+            offered = len(split_lines(lines))
+            if accepted < offered:
+                # Queue full: tell the sender how much got in and when to retry
+                self._send_json(429, {"accepted": accepted, "rejected": offered - accepted},
+                                headers={"Retry-After": "1"})
+            else:
+                self._send_json(202, {"accepted": accepted})
+        elif url.path == "/ack":
+            seq = payload.get("seq", 0)
+            rendered_at = payload.get("rendered_at")
+            if not isinstance(seq, int) or isinstance(seq, bool) or not _is_number(rendered_at, optional=True):
+                self._send_json(400, {"error": "seq must be an integer and rendered_at a number"})
+                return
+            pipeline.ack(seq, rendered_at)
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Per-request logging would dominate the output under load
+        pass
+
+
+def split_lines(lines):
+    """Non-empty lines of a list of strings, splitting any that contain newlines"""
+    return [line.strip() for item in lines for line in item.split("\n") if line.strip()]
+
+
+def _is_number(value, optional=False):
+    """Whether a JSON value is a number (bools excluded), or None when optional"""
+    if value is None:
+        return optional
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def create_server(pipeline, host="127.0.0.1", port=DEFAULT_PORT):
+    """Create (but do not start) an HTTP server for a pipeline"""
+    server = ThreadingHTTPServer((host, port), IngestHandler)
+    server.daemon_threads = True
+    server.pipeline = pipeline
+    return server
+
+
+def fetch_events(url, since, timeout=0.0):
+    """Client helper: scored lines after `since` from an ingest server"""
+    request_timeout = timeout + 5
+    with urllib.request.urlopen(f"{url}/events?since={since}&timeout={timeout}", timeout=request_timeout) as response:
+        return json.load(response)
+
+
+def fetch_stats(url, timeout=5):
+    """Client helper: an ingest server's /stats"""
+    with urllib.request.urlopen(f"{url}/stats", timeout=timeout) as response:
+        return json.load(response)
+
+
+def post_json(url, path, payload, timeout=5):
+    """Client helper: POST a JSON payload; returns (status, response JSON)"""
+    request = urllib.request.Request(
+        f"{url}{path}",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as error:
+        return error.code, json.load(error)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Run the DebatePulse live ingest server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--ai", action="store_true", help="score with the transformers sentiment model instead of keywords")
+    parser.add_argument("--max-queue", type=int, default=1000, help="lines waiting before new ones are rejected")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=50, help="longest wait to fill a batch")
+    args = parser.parse_args()
+
+    analyzer = None
+    if args.ai:
+        import torch
+        from transformers import pipeline
+
+        print("🤖 Loading sentiment analysis model...")
+        analyzer = pipeline(
+            "sentiment-analysis",
+            model="cardiffnlp/twitter-roberta-base-sentiment-latest",
+            device=-1 if not torch.cuda.is_available() else 0
+        )
+
+    ingest = IngestPipeline(analyzer, args.max_queue, args.batch_size, args.max_wait_ms / 1000)
+    server = create_server(ingest, args.host, args.port)
+    print(f"🎙️ DebatePulse ingest server listening on http://{args.host}:{args.port}")
+    print("💡 Press Ctrl+C to stop the server")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down ingest server...")
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
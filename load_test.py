@@ -0,0 +1,681 @@
+#!/usr/bin/env python3
+"""
+DebatePulse - concurrent-user load test
+Simulates analysts using DebatePulse at the same time and reports latency,
+memory and how many concurrent sessions one server can handle
+
+Modes:
+    engine - each session runs the analysis engine the way an app session does
+             (fast, needs only the engine's dependencies)
+    app    - each session drives app.py headlessly through Streamlit's AppTest,
+             including script reruns and widget handling
+"""
+
+import argparse
+import functools
+import gc
+import json
+import math
+import multiprocessing
+import os
+import platform
+import queue
+import random
+import sys
+import threading
+import time
+
+from metrics import percentiles
+from model_registry import MODEL_SIZES_MB, PRECISION_SCALE, SENTIMENT_MODEL, settings_from_env
+from nlp_engine import extract_key_points, extract_speaker_highlights, score_sentiments
+from summary_planner import BART_MODEL
+from transcript_parser import format_timestamp, parse_transcript
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; memory is then read from /proc only
+    resource = None
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+# Concurrent sessions tried by default
+DEFAULT_LEVELS = (1, 2, 4, 8, 16, 32)
+
+# Slowest interaction's p95 that still counts as responsive (seconds)
+DEFAULT_SLO_SECONDS = 2.0
+
+# Steps that include the app's first-load animation; reported separately, not held to the SLO
+FIRST_LOAD_STEPS = ("open",)
+
+# Summary Engine option that runs BART on every summary
+AI_SUMMARY_ENGINE = "🤖 AI (BART)"
+
+# Safety factor applied to the projected memory when sizing instances
+MEMORY_HEADROOM = 1.3
+
+SPEAKERS = ["Dr. Sarah Chen", "Prof. Michael Rodriguez", "Moderator"]
+
+TOPICS = [
+    "carbon taxes", "green jobs", "energy costs", "climate adaptation",
+    "developing economies", "renewable subsidies", "extreme weather", "nuclear power",
+]
+
+TEMPLATES = [
+    "The evidence on {topic} is clear and the benefits outweigh the costs.",
+    "I disagree, because {topic} would hurt working families and cost jobs.",
+    "We need a balanced approach to {topic} that is economically sustainable.",
+    "Studies show {topic} can create new industries and real opportunities.",
+    "The risks of ignoring {topic} are a serious problem for the next decade.",
+    "Let us turn to {topic} and hear both sides on the question.",
+]
+
+SEARCH_TERMS = ["climate", "jobs", "costs", "economic", "evidence", "energy"]
+
+
+def make_transcript(statements, seed):
+    """A synthetic timestamped debate transcript; each seed gives different text"""
+    rng = random.Random(seed)
+    lines = []
+    seconds = 0
+    for i in range(statements):
+        speaker = SPEAKERS[2] if i % 10 == 0 else SPEAKERS[i % 2]
+        sentences = [
+            rng.choice(TEMPLATES).format(topic=rng.choice(TOPICS))
+            for _ in range(rng.randint(1, 3))
+        ]
+        lines.append(f"[{format_timestamp(seconds)}] {speaker}: {' '.join(sentences)}")
+        seconds += rng.randint(5, 40)
+    return "\n".join(lines)
+
+
+def current_rss_mb():
+    """Resident memory of this process in MB (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class MemorySampler:
+    """Background thread tracking the peak RSS while a load level runs"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.peak_mb = current_rss_mb()
+        self._thread = threading.Thread(target=self._run, name="memory-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+
+class VoteTally:
+    """Shared vote counts; the app has no vote store yet, so this stands in for one"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {}
+
+    def vote(self, option):
+        with self._lock:
+            self.counts[option] = self.counts.get(option, 0) + 1
+            return dict(self.counts)
+
+
+class EngineSession:
+    """One analyst's flow run directly against the analysis engine"""
+
+    STEPS = ("upload", "analyze", "search", "vote", "summary")
+
+    def __init__(self, transcript_text, seed, analyzer=None, votes=None):
+        self.transcript_text = transcript_text
+        self.rng = random.Random(seed)
+        self.analyzer = analyzer
+        self.votes = votes if votes is not None else VoteTally()
+        self.transcript_data = []
+
+    def upload(self):
+        self.transcript_data = parse_transcript(self.transcript_text)
+
+    def analyze(self):
+        sentiments = score_sentiments([entry["text"] for entry in self.transcript_data], self.analyzer)
+        for entry, sentiment in zip(self.transcript_data, sentiments):
+            entry["sentiment"] = sentiment
+
+    def search(self):
+        term = self.rng.choice(SEARCH_TERMS)
+        speaker = self.rng.choice(SPEAKERS)
+        matches = [entry for entry in self.transcript_data if term in entry["text"].lower()]
+        return [entry for entry in matches if entry["speaker"] == speaker]
+
+    def vote(self):
+        return self.votes.vote(self.rng.choice(["yes", "no"]))
+
+    def summary(self):
+        return extract_speaker_highlights(self.transcript_data), extract_key_points(self.transcript_data)
+
+
+class AppSession:
+    """One analyst's flow run through app.py with Streamlit's headless AppTest
+
+    AppTest cannot attach files, so the transcript is pasted into the manual
+    transcript box, which goes through the same parser as an uploaded file.
+    The `open` step includes the app's one-second first-load animation, so it
+    is reported as first-load time rather than held to the interaction SLO.
+    """
+
+    STEPS = ("open", "upload", "analyze", "search", "vote", "summary")
+
+    def __init__(self, transcript_text, seed, ai_sentiment=False, summary_engine="⚡ Extractive (fast)", timeout=300):
+        from streamlit.testing.v1 import AppTest
+
+        self.app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.transcript_text = transcript_text
+        self.rng = random.Random(seed)
+        self.ai_sentiment = ai_sentiment
+        self.summary_engine = summary_engine
+
+    def open(self):
+        self._run()
+
+    def upload(self):
+        _widget(self.app.text_area, "Enter debate transcript here:").set_value(self.transcript_text)
+        _widget(self.app.checkbox, "Sentiment Analysis").set_value(self.ai_sentiment)
+        self._run()
+
+    def analyze(self):
+        _widget(self.app.button, "🔍 Analyze Content").click()
+        self._run()
+
+    def search(self):
+        _widget(self.app.text_input, "🔍 Search transcript").set_value(self.rng.choice(SEARCH_TERMS))
+        self._run()
+
+    def vote(self):
+        _widget(self.app.button, "Submit Vote").click()
+        self._run()
+
+    def summary(self):
+        _widget(self.app.selectbox, "Summary Engine").set_value(self.summary_engine)
+        _widget(self.app.checkbox, "Generate Summary").set_value(True)
+        self._run()
+
+    def _run(self):
+        self.app.run()
+        if self.app.exception:
+            raise RuntimeError(self.app.exception[0].message)
+
+
+def new_app_session(transcripts, options, index):
+    """An AppSession for session `index`; picklable through functools.partial"""
+    return AppSession(transcripts[index], index, **options)
+
+
+def _widget(elements, label):
+    """The first AppTest element with a given label"""
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"widget not found: {label}")
+
+
+def run_flows(make_session, index, flows, think_seconds, start):
+    """Set up one session, wait for the others at `start`, then run its flows
+
+    Returns the session's per-step latencies, flow durations, errors and the
+    wall-clock time its flows started.
+    """
+    latencies = {}
+    flow_times = []
+    try:
+        session = make_session(index)
+    except Exception as error:
+        start.abort()
+        return latencies, flow_times, [f"session setup: {error}"], None
+    try:
+        start.wait()
+    except threading.BrokenBarrierError:
+        return latencies, flow_times, [], None
+
+    started = time.time()
+    for _ in range(flows):
+        flow_started = time.perf_counter()
+        for step in session.STEPS:
+            step_started = time.perf_counter()
+            try:
+                getattr(session, step)()
+            except Exception as error:
+                return latencies, flow_times, [f"{step}: {error}"], started
+            latencies.setdefault(step, []).append(time.perf_counter() - step_started)
+            if think_seconds:
+                time.sleep(think_seconds)
+        flow_times.append(time.perf_counter() - flow_started)
+    return latencies, flow_times, [], started
+
+
+def _session_process(make_session, index, flows, think_seconds, start, results):
+    """Body of an isolated session's process
+
+    A throwaway flow first warms up imports, caches and models, so the RSS
+    after it is this process's baseline and the growth past it is what the
+    session itself costs.
+    """
+    *_, warm_up_errors, _ = run_flows(make_session, index, 1, 0.0, threading.Barrier(1))
+    gc.collect()
+    baseline_mb = current_rss_mb()
+    if warm_up_errors:
+        start.abort()
+        results.put({"index": index, "latencies": {}, "flow_times": [], "errors": warm_up_errors,
+                     "started": None, "finished": None, "baseline_mb": baseline_mb, "peak_mb": baseline_mb})
+        return
+    with MemorySampler() as memory:
+        latencies, flow_times, errors, started = run_flows(make_session, index, flows, think_seconds, start)
+    results.put({"index": index, "latencies": latencies, "flow_times": flow_times, "errors": errors,
+                 "started": started, "finished": time.time(), "baseline_mb": baseline_mb, "peak_mb": memory.peak_mb})
+
+
+def _run_isolated(make_session, sessions, flows, think_seconds):
+    """Run each session in its own process; returns the processes' results"""
+    context = multiprocessing.get_context("spawn")
+    start = context.Barrier(sessions)
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=_session_process,
+            args=(make_session, i, flows, think_seconds, start, results),
+            name=f"session-{i}",
+            daemon=True
+        )
+        for i in range(sessions)
+    ]
+    for process in processes:
+        process.start()
+
+    collected = {}
+    while len(collected) < sessions:
+        try:
+            result = results.get(timeout=1)
+        except queue.Empty:
+            crashed = [i for i, process in enumerate(processes) if i not in collected and not process.is_alive()]
+            if crashed:
+                # Do not leave the other sessions waiting for one that will never arrive
+                start.abort()
+                if len(crashed) + len(collected) == sessions:
+                    for i in crashed:
+                        collected[i] = {"errors": [f"session process exited with code {processes[i].exitcode}"]}
+            continue
+        collected[result["index"]] = result
+    for process in processes:
+        process.join()
+    return list(collected.values())
+
+
+def run_level(make_session, sessions, flows, think_seconds=0.0, isolated=False):
+    """Run `sessions` concurrent sessions through `flows` flows each
+
+    Sessions run as threads in this process, or with `isolated` in separate
+    processes, for session code that is not safe to run side by side in one
+    interpreter. Each isolated session carries its own copy of the runtime,
+    so memory is modeled as one shared server: the largest process baseline
+    plus every session's growth past its own baseline.
+
+    Returns per-step latencies, flow durations, error count, wall time,
+    baseline and peak memory for the level. `make_session` must be picklable
+    when `isolated`.
+    """
+    latencies = {}
+    flow_times = []
+    errors = []
+
+    def record(session_latencies, session_flow_times, session_errors):
+        for step, values in session_latencies.items():
+            latencies.setdefault(step, []).extend(values)
+        flow_times.extend(session_flow_times)
+        errors.extend(session_errors)
+
+    if isolated:
+        collected = _run_isolated(make_session, sessions, flows, think_seconds)
+        for result in collected:
+            record(result.get("latencies", {}), result.get("flow_times", []), result["errors"])
+        measured = [result for result in collected if "baseline_mb" in result]
+        baseline_mb = max((result["baseline_mb"] for result in measured), default=0.0)
+        peak_mb = baseline_mb + sum(max(0.0, result["peak_mb"] - result["baseline_mb"]) for result in measured)
+        timed = [result for result in measured if result["started"] is not None]
+        wall_seconds = (
+            max(result["finished"] for result in timed) - min(result["started"] for result in timed)
+            if timed else 0.0
+        )
+    else:
+        lock = threading.Lock()
+        start = threading.Barrier(sessions)
+
+        def session_thread(index):
+            session_latencies, session_flow_times, session_errors, _ = run_flows(
+                make_session, index, flows, think_seconds, start
+            )
+            with lock:
+                record(session_latencies, session_flow_times, session_errors)
+
+        threads = [threading.Thread(target=session_thread, args=(i,), name=f"session-{i}") for i in range(sessions)]
+        baseline_mb = current_rss_mb()
+        with MemorySampler() as memory:
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            wall_seconds = time.perf_counter() - started
+        peak_mb = memory.peak_mb
+
+    steps = {step: percentiles(values) for step, values in latencies.items()}
+    return {
+        "sessions": sessions,
+        "flows": len(flow_times),
+        "wall_seconds": wall_seconds,
+        "flows_per_minute": len(flow_times) / wall_seconds * 60 if wall_seconds else 0.0,
+        "steps": steps,
+        "flow": percentiles(flow_times),
+        "slowest_step_p95": max(
+            (values["p95"] for step, values in steps.items() if step not in FIRST_LOAD_STEPS), default=None
+        ),
+        "first_load_p95": max((steps[step]["p95"] for step in FIRST_LOAD_STEPS if step in steps), default=None),
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "baseline_rss_mb": baseline_mb,
+        "peak_rss_mb": peak_mb,
+    }
+
+
+def model_memory_mb(measured=(), cuda_available=False):
+    """Model memory a server needs beyond what the test measured (MB)
+
+    The app's registry keeps each model it registers loaded once per server,
+    scaled by the configured precision and capped by the model budget.
+    `measured` names the models that were already resident while memory was
+    measured.
+    """
+    settings = settings_from_env(cuda_available)
+    scale = PRECISION_SCALE[settings["precision"]]
+    needed = sum(MODEL_SIZES_MB.values()) * scale
+    if settings["budget_mb"]:
+        needed = min(needed, settings["budget_mb"])
+    return max(0.0, needed - sum(MODEL_SIZES_MB[name] for name in measured) * scale)
+
+
+def capacity_report(levels, baseline_mb, slo_seconds, target_sessions=None, model_mb=0.0):
+    """Summarize load levels into capacity and sizing figures
+
+    `model_mb` is model memory the server needs that the measured baseline
+    does not include; it is added once per instance.
+    """
+    passing = [
+        level for level in levels
+        if not level["errors"] and level["slowest_step_p95"] is not None
+        and level["slowest_step_p95"] <= slo_seconds
+    ]
+    capacity = max((level["sessions"] for level in passing), default=0)
+
+    # Memory grows roughly linearly with sessions; least-squares slope through
+    # the baseline (0 sessions) and every level's peak
+    points = [(0, baseline_mb)] + [(level["sessions"], level["peak_rss_mb"]) for level in levels]
+    mean_sessions = sum(sessions for sessions, _ in points) / len(points)
+    mean_mb = sum(mb for _, mb in points) / len(points)
+    spread = sum((sessions - mean_sessions) ** 2 for sessions, _ in points)
+    slope = sum((sessions - mean_sessions) * (mb - mean_mb) for sessions, mb in points) / spread
+    peak_mb = max(level["peak_rss_mb"] for level in levels)
+    per_session_mb = max(0.0, slope)
+
+    report = {
+        "slo_seconds": slo_seconds,
+        "max_sessions_within_slo": capacity,
+        "baseline_rss_mb": baseline_mb,
+        "peak_rss_mb": peak_mb,
+        "per_session_mb": per_session_mb,
+        "model_memory_mb": model_mb,
+        "instance_memory_mb": (baseline_mb + model_mb + per_session_mb * max(capacity, 1)) * MEMORY_HEADROOM,
+    }
+    if target_sessions:
+        report["target_sessions"] = target_sessions
+        report["instances_needed"] = math.ceil(target_sessions / capacity) if capacity else None
+    return report
+
+
+def format_report(config, levels, capacity):
+    """Markdown capacity report"""
+    def ms(values, point):
+        if not values:
+            return "-"
+        milliseconds = values[point] * 1000
+        return f"{milliseconds:.1f}" if milliseconds < 10 else f"{milliseconds:.0f}"
+
+    lines = [
+        "# DebatePulse capacity report",
+        "",
+        f"- Mode: {config['mode']} ({'AI' if config['ai'] else 'keyword'} sentiment)",
+        "- Sessions: " + (
+            "one process each, memory modeled as one shared server. Each process has its own "
+            "inference service and model registry, so model-backed steps are not batched or "
+            "queued across sessions as on a real server"
+            if config["isolated"] else "threads in one process"
+        ),
+        f"- Host: {config['cpus']} CPUs, Python {config['python']} on {config['platform']}",
+        f"- Flow: {' → '.join(config['steps'])}, {config['flows']} flow(s) per session, "
+        f"{config['statements']} statements per transcript, {config['think_seconds']:g}s think time",
+        f"- SLO: slowest interaction p95 ≤ {capacity['slo_seconds']:g}s"
+        + (f" ({', '.join(FIRST_LOAD_STEPS)} excluded: it includes the first-load animation)"
+           if any(step in FIRST_LOAD_STEPS for step in config["steps"]) else ""),
+        "",
+        "| Sessions | Flows/min | Slowest step p95 (ms) | First load p95 (ms) | Flow p50 / p95 / p99 (ms) | Peak RSS (MB) | Errors |",
+        "|---:|---:|---:|---:|---|---:|---:|",
+    ]
+    for level in levels:
+        slowest = f"{level['slowest_step_p95'] * 1000:.0f}" if level["slowest_step_p95"] is not None else "-"
+        first_load = f"{level['first_load_p95'] * 1000:.0f}" if level["first_load_p95"] is not None else "-"
+        flow = level["flow"]
+        lines.append(
+            f"| {level['sessions']} | {level['flows_per_minute']:.1f} | {slowest} | {first_load} | "
+            f"{ms(flow, 'p50')} / {ms(flow, 'p95')} / {ms(flow, 'p99')} | "
+            f"{level['peak_rss_mb']:.0f} | {level['errors']} |"
+        )
+
+    lines += [
+        "",
+        "## Per-step latency (ms, p50 / p95 / p99)",
+        "",
+        "| Sessions | " + " | ".join(config["steps"]) + " |",
+        "|---:|" + "---|" * len(config["steps"]),
+    ]
+    for level in levels:
+        cells = [
+            f"{ms(level['steps'].get(step), 'p50')} / {ms(level['steps'].get(step), 'p95')} / {ms(level['steps'].get(step), 'p99')}"
+            for step in config["steps"]
+        ]
+        lines.append(f"| {level['sessions']} | " + " | ".join(cells) + " |")
+
+    lines += [
+        "",
+        "## Capacity",
+        "",
+        f"- Max concurrent sessions within the SLO: **{capacity['max_sessions_within_slo']}**"
+        + (" (no tested level met the SLO)" if not capacity["max_sessions_within_slo"] else "")
+        + (" (the highest level tested; test more sessions to find the limit)"
+           if capacity["max_sessions_within_slo"] == levels[-1]["sessions"] else ""),
+        f"- Memory: {capacity['baseline_rss_mb']:.0f} MB baseline, ~{capacity['per_session_mb']:.1f} MB per active session, "
+        f"{capacity['peak_rss_mb']:.0f} MB peak",
+        f"- Models not resident during the test: {capacity['model_memory_mb']:.0f} MB "
+        f"(the app's models at {config['precision']}, capped by DEBATEPULSE_MODEL_BUDGET_MB when set)",
+        f"- Suggested instance memory: {capacity['instance_memory_mb']:.0f} MB "
+        f"(baseline + models + capacity × per-session, {MEMORY_HEADROOM:g}× headroom)",
+    ]
+    if "target_sessions" in capacity:
+        needed = capacity["instances_needed"]
+        lines.append(
+            f"- Instances for {capacity['target_sessions']} concurrent sessions: "
+            + (f"**{needed}**" if needed else "unknown (raise the SLO or test smaller levels)")
+        )
+    errors = [sample for level in levels for sample in level["error_samples"]]
+    if errors:
+        lines += ["", "## Errors", ""] + [f"- {sample}" for sample in errors[:10]]
+    return "\n".join(lines) + "\n"
+
+
+def build_ai_analyzer():
+    """Sentiment model served through the shared inference service, as in the app"""
+    import torch
+    from transformers import pipeline
+
+    from inference_service import InferenceService
+    from model_registry import ModelRegistry, apply_precision, pipeline_kwargs
+
+    cuda_available = torch.cuda.is_available()
+
+    def load(precision):
+        analyzer = pipeline(
+            "sentiment-analysis",
+            model=SENTIMENT_MODEL,
+            device=-1 if not cuda_available else 0,
+            **pipeline_kwargs(precision, cuda_available)
+        )
+        return apply_precision(analyzer, precision, cuda_available)
+
+    registry = ModelRegistry(**settings_from_env(cuda_available))
+    registry.register(SENTIMENT_MODEL, load, MODEL_SIZES_MB[SENTIMENT_MODEL])
+    service = InferenceService(registry)
+    print("🤖 Loading sentiment analysis model...")
+    service.ensure_loaded(SENTIMENT_MODEL)
+    return service.client(SENTIMENT_MODEL)
+
+
+def cuda_available():
+    """Whether models would load on a GPU here (False without torch)"""
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Load test DebatePulse with concurrent simulated analysts")
+    parser.add_argument("--mode", choices=["engine", "app"], default="engine",
+                        help="drive the analysis engine directly or app.py through Streamlit's AppTest")
+    parser.add_argument("--levels", default=",".join(map(str, DEFAULT_LEVELS)),
+                        help="comma-separated concurrent session counts to test")
+    parser.add_argument("--flows", type=int, default=3, help="flows each session runs per level")
+    parser.add_argument("--statements", type=int, default=120, help="statements per simulated transcript")
+    parser.add_argument("--think", type=float, default=0.0, help="seconds each analyst pauses between steps")
+    parser.add_argument("--ai", action="store_true", help="score sentiment with the transformers model")
+    parser.add_argument("--summary-engine", default="⚡ Extractive (fast)", help="app mode: Summary Engine option to use")
+    parser.add_argument("--slo", type=float, default=DEFAULT_SLO_SECONDS, help="p95 seconds allowed for the slowest step")
+    parser.add_argument("--target-sessions", type=int, help="concurrent sessions to size instances for")
+    parser.add_argument("--report", help="write the markdown report here instead of printing it")
+    parser.add_argument("--json", help="also write the raw results as JSON")
+    args = parser.parse_args()
+
+    levels = sorted({int(level) for level in args.levels.split(",") if level.strip()})
+    transcripts = {}
+
+    def transcript_for(index):
+        # Sessions reuse their transcript across levels, like analysts re-running their own debate
+        if index not in transcripts:
+            transcripts[index] = make_transcript(args.statements, seed=index)
+        return transcripts[index]
+
+    for index in range(max(levels)):
+        transcript_for(index)
+
+    # AppTest instances in one interpreter share script and widget state, so
+    # app sessions each get their own process. That also gives each one its own
+    # cached inference service and models, which the report points out.
+    isolated = args.mode == "app"
+    if isolated:
+        steps = AppSession.STEPS
+        make_session = functools.partial(
+            new_app_session, transcripts, {"ai_sentiment": args.ai, "summary_engine": args.summary_engine}
+        )
+    else:
+        steps = EngineSession.STEPS
+        analyzer = build_ai_analyzer() if args.ai else None
+        votes = VoteTally()
+        make_session = lambda index: EngineSession(transcript_for(index), index, analyzer, votes)
+
+    # Warm up imports, caches and models so the first level is not charged for them
+    # (isolated sessions warm up in their own processes)
+    if not isolated:
+        print("🔥 Warming up...")
+        run_level(make_session, 1, 1)
+        baseline_mb = current_rss_mb()
+
+    results = []
+    for sessions in levels:
+        print(f"👥 {sessions} concurrent session(s)...", flush=True)
+        level = run_level(make_session, sessions, args.flows, args.think, isolated)
+        results.append(level)
+        slowest = level["slowest_step_p95"]
+        print(f"   slowest interaction p95 {slowest * 1000:.0f}ms, peak {level['peak_rss_mb']:.0f} MB, {level['errors']} error(s)"
+              if slowest is not None else f"   no completed steps, {level['errors']} error(s)")
+
+    if isolated:
+        baseline_mb = max(level["baseline_rss_mb"] for level in results)
+
+    # Models the flow loaded are in the measured baseline; the rest still need room
+    measured_models = set()
+    if args.ai:
+        measured_models.add(SENTIMENT_MODEL)
+    if isolated and args.summary_engine == AI_SUMMARY_ENGINE:
+        measured_models.add(BART_MODEL)
+    on_gpu = cuda_available()
+
+    config = {
+        "mode": args.mode,
+        "ai": args.ai,
+        "isolated": isolated,
+        "steps": list(steps),
+        "flows": args.flows,
+        "statements": args.statements,
+        "think_seconds": args.think,
+        "precision": settings_from_env(on_gpu)["precision"],
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "platform": platform.system(),
+    }
+    capacity = capacity_report(
+        results, baseline_mb, args.slo, args.target_sessions, model_memory_mb(measured_models, on_gpu)
+    )
+    report = format_report(config, results, capacity)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as report_file:
+            report_file.write(report)
+        print(f"📄 Report written to {args.report}")
+    else:
+        print("=" * 50)
+        print(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump({"config": config, "levels": results, "capacity": capacity}, json_file, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+if __name__ == "__main__":
+    main()
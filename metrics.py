@@ -0,0 +1,13 @@
+"""
+DebatePulse - latency metrics
+Percentile summaries shared by the inference service, ingest server and load tools
+"""
+
+
+def percentiles(values, points=(50, 95, 99)):
+    """Nearest-rank percentiles of a list of numbers ({} when empty)"""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return {f"p{point}": ordered[min(last, int(round(point / 100 * last)))] for point in points}
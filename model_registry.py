@@ -0,0 +1,346 @@
+"""
+DebatePulse - model memory manager
+Loads models lazily, keeps them within a memory budget and unloads idle ones
+
+Configuration (environment variables):
+    DEBATEPULSE_MODEL_BUDGET_MB     - resident model memory allowed (0 = unlimited)
+    DEBATEPULSE_MODEL_IDLE_MINUTES  - unload a model unused for this long (0 = never)
+    DEBATEPULSE_MODEL_PRECISION     - float32 (default), bfloat16, float16 (GPU only) or
+                                      int8 (CPU only); others load as float32
+"""
+
+import gc
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from summary_planner import BART_MODEL, DISTILBART_MODEL
+
+PRECISIONS = ("float32", "float16", "bfloat16", "int8")
+
+# Resident size relative to float32 weights
+PRECISION_SCALE = {"float32": 1.0, "float16": 0.5, "bfloat16": 0.5, "int8": 0.35}
+
+SENTIMENT_MODEL = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+
+# Approximate float32 resident size of each model the app registers (MB), used to plan the memory budget
+MODEL_SIZES_MB = {
+    SENTIMENT_MODEL: 500,
+    BART_MODEL: 1630,
+    DISTILBART_MODEL: 1220,
+}
+
+# How often the idle janitor looks for models to unload
+JANITOR_INTERVAL_SECONDS = 30
+
+# Longest a load waits for busy models to finish before giving up on the budget
+BUDGET_WAIT_SECONDS = 60
+
+
+class ModelBudgetError(RuntimeError):
+    """A model cannot be loaded without exceeding the memory budget"""
+
+
+def effective_precision(precision, cuda_available=False):
+    """The precision a model is actually loaded in on this device
+
+    float16 is only used on GPU and int8 dynamic quantization only on CPU;
+    otherwise models load in float32.
+    """
+    if precision not in PRECISIONS:
+        return "float32"
+    if (precision == "float16" and not cuda_available) or (precision == "int8" and cuda_available):
+        return "float32"
+    return precision
+
+
+def settings_from_env(cuda_available=False):
+    """Registry settings from the DEBATEPULSE_MODEL_* environment variables"""
+    precision = effective_precision(
+        os.environ.get("DEBATEPULSE_MODEL_PRECISION", "float32").lower(), cuda_available
+    )
+    return {
+        "budget_mb": float(os.environ.get("DEBATEPULSE_MODEL_BUDGET_MB", 0)),
+        "idle_seconds": float(os.environ.get("DEBATEPULSE_MODEL_IDLE_MINUTES", 30)) * 60,
+        "precision": precision,
+    }
+
+
+def pipeline_kwargs(precision, cuda_available=False):
+    """Extra transformers.pipeline() arguments for a precision
+
+    Weights are loaded with low_cpu_mem_usage, so safetensors checkpoints are
+    memory-mapped instead of being copied through a second full-size buffer.
+    """
+    kwargs = {"model_kwargs": {"low_cpu_mem_usage": True}}
+    precision = effective_precision(precision, cuda_available)
+    if precision in ("float16", "bfloat16"):
+        import torch
+
+        kwargs["torch_dtype"] = getattr(torch, precision)
+    return kwargs
+
+
+def apply_precision(model_pipeline, precision, cuda_available=False):
+    """Post-load precision changes: int8 dynamic quantization of Linear layers on CPU"""
+    if effective_precision(precision, cuda_available) == "int8":
+        import torch
+
+        model_pipeline.model = torch.quantization.quantize_dynamic(
+            model_pipeline.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    return model_pipeline
+
+
+def resident_mb(model_pipeline):
+    """Memory held by a pipeline's weights and buffers, in MB (None if unknown)
+
+    Tensors are counted once per data pointer, so tied weights (BART's shared
+    embeddings and lm_head are one tensor) are not counted again under each
+    name. Dynamic-quantized Linear layers keep their int8 weights packed
+    outside parameters(), so those are read through the layer's weight() and
+    bias(). None, and the registry uses the precision-scaled estimate, when
+    the packed weights cannot be read.
+    """
+    model = getattr(model_pipeline, "model", None)
+    if model is None or not hasattr(model, "parameters"):
+        return None
+
+    sizes = {}
+    # Unpacked weights are fresh tensors; holding them keeps their addresses unique
+    unpacked = []
+
+    def count(tensor):
+        if tensor is not None:
+            pointer = tensor.data_ptr() or id(tensor)
+            sizes[pointer] = max(sizes.get(pointer, 0), tensor.numel() * tensor.element_size())
+
+    for tensor in model.parameters():
+        count(tensor)
+    for tensor in model.buffers():
+        count(tensor)
+    for module in model.modules():
+        # Quantized layers expose weight() as a method; their packed-params holder does not
+        if hasattr(module, "_packed_params") and callable(getattr(module, "weight", None)):
+            try:
+                weight, bias = module.weight(), module.bias()
+            except (RuntimeError, TypeError):
+                return None
+            unpacked.append((weight, bias))
+            count(weight)
+            count(bias)
+    return sum(sizes.values()) / (1024 * 1024)
+
+
+class _Entry:
+    def __init__(self, loader, estimated_mb):
+        self.loader = loader
+        self.estimated_mb = estimated_mb
+        self.model = None
+        self.size_mb = 0.0
+        self.in_use = 0
+        self.last_used = 0.0
+        self.loads = 0
+        self.evictions = 0
+        self.loading = False
+
+
+class ModelRegistry:
+    """Lazily loaded models kept within a memory budget
+
+    `register(name, loader, estimated_mb)` declares a model; `loader(precision)`
+    builds it. `acquire(name)` loads the model if needed and marks it busy
+    while in use. Before a load, the least recently used idle models are
+    unloaded until the new model fits in `budget_mb`. A background janitor
+    unloads models unused for `idle_seconds`; they reload on the next acquire.
+    """
+
+    def __init__(self, budget_mb=0, idle_seconds=0, precision="float32"):
+        if precision not in PRECISIONS:
+            raise ValueError(f"precision must be one of {', '.join(PRECISIONS)}")
+        self.budget_mb = budget_mb
+        self.idle_seconds = idle_seconds
+        self.precision = precision
+        self._entries = {}
+        self._lock = threading.Condition()
+
+        if idle_seconds > 0:
+            janitor = threading.Thread(target=self._janitor, name="model-janitor", daemon=True)
+            janitor.start()
+
+    def register(self, name, loader, estimated_mb):
+        """Declare a model; nothing is loaded until it is acquired"""
+        with self._lock:
+            self._entries[name] = _Entry(loader, estimated_mb * PRECISION_SCALE[self.precision])
+
+    def names(self):
+        return list(self._entries)
+
+    def is_loaded(self, name):
+        return self._entries[name].model is not None
+
+    def loaded_models(self):
+        with self._lock:
+            return {name for name, entry in self._entries.items() if entry.model is not None}
+
+    def resident_mb(self):
+        """Total size of the loaded models"""
+        with self._lock:
+            return sum(entry.size_mb for entry in self._entries.values() if entry.model is not None)
+
+    @contextmanager
+    def acquire(self, name):
+        """Use a model, loading it first if needed; it cannot be evicted while held"""
+        model = self._checkout(name)
+        try:
+            yield model
+        finally:
+            with self._lock:
+                entry = self._entries[name]
+                entry.in_use -= 1
+                entry.last_used = time.monotonic()
+                self._lock.notify_all()
+
+    def load(self, name):
+        """Load a model now without holding it"""
+        with self.acquire(name):
+            pass
+
+    def unload(self, name):
+        """Unload a model if it is idle; returns whether it was unloaded"""
+        with self._lock:
+            unloaded = self._unload_locked(name)
+        if unloaded:
+            _release_memory()
+        return unloaded
+
+    def stats(self):
+        """Per-model load state, size (MB), idle time and load / eviction counts"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {
+                    "loaded": entry.model is not None,
+                    "size_mb": entry.size_mb if entry.model is not None else entry.estimated_mb,
+                    "in_use": entry.in_use,
+                    "idle_seconds": now - entry.last_used if entry.model is not None else None,
+                    "loads": entry.loads,
+                    "evictions": entry.evictions,
+                }
+                for name, entry in self._entries.items()
+            }
+
+    def _checkout(self, name):
+        freed = False
+        should_load = False
+        with self._lock:
+            entry = self._entries[name]
+            while True:
+                # Another thread may be loading this model; wait for it
+                while entry.loading:
+                    self._lock.wait()
+                if entry.model is not None:
+                    break
+                freed = self._make_room_locked(name, entry.estimated_mb) or freed
+                # Making room can wait, so check again that nobody else started loading
+                if entry.loading or entry.model is not None:
+                    continue
+                entry.loading = True
+                should_load = True
+                break
+            entry.in_use += 1
+
+        if freed:
+            _release_memory()
+
+        if should_load:
+            try:
+                model = entry.loader(self.precision)
+            except BaseException:
+                with self._lock:
+                    entry.loading = False
+                    entry.in_use -= 1
+                    self._lock.notify_all()
+                raise
+            size = resident_mb(model)
+            with self._lock:
+                entry.model = model
+                entry.size_mb = size if size is not None else entry.estimated_mb
+                entry.loads += 1
+                entry.loading = False
+                self._lock.notify_all()
+
+        return entry.model
+
+    def _make_room_locked(self, name, needed_mb):
+        """Unload least recently used idle models until `needed_mb` fits (lock held)"""
+        if not self.budget_mb:
+            return False
+        deadline = time.monotonic() + BUDGET_WAIT_SECONDS
+        freed = False
+        while self._reserved_mb_locked() + needed_mb > self.budget_mb:
+            idle = [
+                (entry.last_used, other)
+                for other, entry in self._entries.items()
+                if other != name and entry.model is not None and entry.in_use == 0
+            ]
+            if idle:
+                _, victim = min(idle)
+                self._unload_locked(victim)
+                self._entries[victim].evictions += 1
+                freed = True
+                continue
+            busy = [other for other, entry in self._entries.items()
+                    if other != name and (entry.model is not None or entry.loading)]
+            remaining = deadline - time.monotonic()
+            if not busy or remaining <= 0:
+                raise ModelBudgetError(
+                    f"{name} needs ~{needed_mb:.0f} MB but only "
+                    f"{self.budget_mb - self._reserved_mb_locked():.0f} MB of the "
+                    f"{self.budget_mb:.0f} MB model budget is free"
+                )
+            # Wait for a busy model to be released, then try again
+            self._lock.wait(remaining)
+        return freed
+
+    def _reserved_mb_locked(self):
+        return sum(
+            entry.size_mb if entry.model is not None else entry.estimated_mb
+            for entry in self._entries.values()
+            if entry.model is not None or entry.loading
+        )
+
+    def _unload_locked(self, name):
+        entry = self._entries[name]
+        if entry.model is None or entry.in_use:
+            return False
+        entry.model = None
+        entry.size_mb = 0.0
+        return True
+
+    def _janitor(self):
+        """Unload models that have been idle longer than idle_seconds"""
+        while True:
+            time.sleep(min(JANITOR_INTERVAL_SECONDS, self.idle_seconds))
+            now = time.monotonic()
+            with self._lock:
+                expired = [
+                    name for name, entry in self._entries.items()
+                    if entry.model is not None and entry.in_use == 0
+                    and now - entry.last_used > self.idle_seconds
+                ]
+                unloaded = [name for name in expired if self._unload_locked(name)]
+            if unloaded:
+                _release_memory()
+
+
+def _release_memory():
+    """Return freed model memory to the allocator (and the GPU cache)"""
+    gc.collect()
+    try:
+        import torch
+    except ImportError:
+        return
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
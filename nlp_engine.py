@@ -0,0 +1,306 @@
+"""
+DebatePulse - text analytics engine
+Model-free analysis helpers shared by the Streamlit app and offline tools
+"""
+
+import hashlib
+import re
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, TfidfVectorizer
+
+# Sentence boundary: terminal punctuation followed by whitespace
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+# Runs of punctuation and whitespace, collapsed when comparing sentences for repeats
+NON_WORD = re.compile(r'[\W_]+')
+
+# Sentences shorter than this are fillers ("Yes.", "Thank you.") and never ranked
+MIN_SENTENCE_WORDS = 4
+
+# Key phrases are 1-3 word n-grams; longer phrases get a mild boost over single words
+KEY_PHRASE_NGRAMS = (1, 3)
+KEY_PHRASE_LENGTH_BOOST = 0.5
+
+# Key phrase words (starting with a letter) and the punctuation phrases never span
+KEY_PHRASE_TOKEN = re.compile(r"(?u)\b[^\W\d_][\w'-]*\b")
+PHRASE_BREAK = re.compile(r'[.!?;:,()"]+')
+
+# A candidate sharing this many content words with a chosen key phrase repeats it
+KEY_PHRASE_MAX_OVERLAP = 2
+
+
+def simple_sentiment_analysis(text):
+    """Simple keyword-based sentiment analysis"""
+    positive_words = ['good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 'positive', 'benefit', 'advantage', 'support', 'agree', 'yes', 'right', 'correct', 'true', 'clear', 'obvious', 'evidence', 'proven', 'success', 'win', 'victory', 'hope', 'future', 'progress', 'improve', 'better', 'best', 'love', 'like', 'enjoy', 'happy', 'pleased', 'satisfied', 'confident', 'sure', 'certain', 'definitely', 'absolutely', 'completely', 'totally', 'fully', 'strongly', 'firmly', 'clearly', 'obviously', 'undoubtedly', 'indeed', 'certainly', 'surely', 'definitely', 'absolutely', 'completely', 'totally', 'fully', 'strongly', 'firmly', 'clearly', 'obviously', 'undoubtedly', 'indeed', 'certainly', 'surely']
+    
+    negative_words = ['bad', 'terrible', 'awful', 'horrible', 'disgusting', 'negative', 'problem', 'issue', 'concern', 'worry', 'fear', 'danger', 'risk', 'threat', 'harm', 'damage', 'destruction', 'disaster', 'crisis', 'emergency', 'urgent', 'critical', 'serious', 'severe', 'extreme', 'worst', 'worst', 'hate', 'dislike', 'angry', 'frustrated', 'disappointed', 'sad', 'depressed', 'worried', 'anxious', 'nervous', 'scared', 'afraid', 'concerned', 'troubled', 'bothered', 'upset', 'annoyed', 'irritated', 'furious', 'outraged', 'disgusted', 'shocked', 'surprised', 'confused', 'lost', 'helpless', 'hopeless', 'desperate', 'despair', 'gloom', 'doom', 'pessimistic', 'cynical', 'skeptical', 'doubtful', 'uncertain', 'unsure', 'confused', 'lost', 'helpless', 'hopeless', 'desperate', 'despair', 'gloom', 'doom', 'pessimistic', 'cynical', 'skeptical', 'doubtful', 'uncertain', 'unsure']
+    
+    text_lower = text.lower()
+    
+    positive_count = sum(1 for word in positive_words if word in text_lower)
+    negative_count = sum(1 for word in negative_words if word in text_lower)
+    
+    if positive_count > negative_count:
+        return 'positive'
+    elif negative_count > positive_count:
+        return 'negative'
+    else:
+        return 'neutral'
+
+
+def map_sentiment_label(label):
+    """Map a model's sentiment label onto positive / negative / neutral"""
+    sentiment = label.lower()
+    if 'positive' in sentiment or 'joy' in sentiment:
+        return 'positive'
+    elif 'negative' in sentiment or 'sad' in sentiment or 'anger' in sentiment:
+        return 'negative'
+    else:
+        return 'neutral'
+
+
+def score_sentiments(texts, analyzer=None, batch_size=32):
+    """Score many statements in one pass
+
+    With a transformers pipeline the texts go through it in batches; without
+    one the keyword analysis is used instead.
+    """
+    texts = list(texts)
+    if analyzer is None:
+        return [simple_sentiment_analysis(text) for text in texts]
+    if not texts:
+        return []
+
+    try:
+        results = analyzer(texts, batch_size=batch_size, truncation=True)
+    except Exception:
+        return ['neutral'] * len(texts)
+    return [map_sentiment_label(result['label']) for result in results]
+
+
+def transcript_hash(transcript_data):
+    """Stable content hash of a transcript, used as a cache key"""
+    digest = hashlib.blake2b(digest_size=16)
+    for entry in transcript_data:
+        digest.update(entry['speaker'].encode('utf-8'))
+        digest.update(b'\x1f')
+        digest.update(entry['text'].encode('utf-8'))
+        digest.update(b'\x1e')
+    return digest.hexdigest()
+
+
+def split_sentences(transcript_data):
+    """Split every statement into sentences, remembering who said each one"""
+    sentences = []
+    speaker_ids = []
+    speakers = {}
+
+    for entry in transcript_data:
+        speaker_id = speakers.setdefault(entry['speaker'], len(speakers))
+        for sentence in SENTENCE_BOUNDARY.split(entry['text'].strip()):
+            if len(sentence.split()) >= MIN_SENTENCE_WORDS:
+                sentences.append(sentence)
+                speaker_ids.append(speaker_id)
+
+    return sentences, np.asarray(speaker_ids, dtype=np.intp), list(speakers)
+
+
+def normalize_sentence(sentence):
+    """Lowercase a sentence and drop punctuation so repeats compare equal"""
+    return NON_WORD.sub(' ', sentence.lower()).strip()
+
+
+def score_sentences(sentences, speaker_ids, n_speakers):
+    """Score each sentence by its summed cosine similarity to the speaker's other sentences
+
+    This is TextRank's degree centrality computed through the speaker's TF-IDF
+    centroid, so it costs O(nnz) instead of building the n x n similarity graph.
+    """
+    vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True, dtype=np.float32)
+    try:
+        matrix = vectorizer.fit_transform(sentences)
+    except ValueError:
+        # Only stop words - nothing to rank on
+        return np.zeros(len(sentences), dtype=np.float32)
+
+    n_sentences = matrix.shape[0]
+    membership = sparse.csr_matrix(
+        (np.ones(n_sentences, dtype=np.float32), (speaker_ids, np.arange(n_sentences))),
+        shape=(n_speakers, n_sentences)
+    )
+    centroids = (membership @ matrix).toarray()
+
+    # Row-wise dot product of each sentence with its own speaker's centroid
+    rows = np.repeat(np.arange(n_sentences), np.diff(matrix.indptr))
+    weights = matrix.data * centroids[speaker_ids[rows], matrix.indices]
+    scores = np.bincount(rows, weights=weights, minlength=n_sentences)
+
+    # Remove each sentence's similarity with itself
+    self_similarity = np.bincount(rows, weights=matrix.data ** 2, minlength=n_sentences)
+    return scores - self_similarity
+
+
+def extract_speaker_highlights(transcript_data, sentences_per_speaker=3):
+    """Pick the most representative sentences of each speaker, in speaking order"""
+    sentences, speaker_ids, speakers = split_sentences(transcript_data)
+    highlights = {speaker: [] for speaker in speakers}
+    if not sentences:
+        return highlights
+
+    scores = score_sentences(sentences, speaker_ids, len(speakers))
+
+    # Walk each speaker's sentences best-first (sorted by speaker, then by
+    # descending score), skipping repeats of a sentence already picked
+    order = np.lexsort((-scores, speaker_ids))
+    group_starts = np.searchsorted(speaker_ids[order], np.arange(len(speakers) + 1))
+    chosen = []
+    for start, end in zip(group_starts[:-1].tolist(), group_starts[1:].tolist()):
+        seen = set()
+        for index in order[start:end].tolist():
+            key = normalize_sentence(sentences[index])
+            if key in seen:
+                continue
+            seen.add(key)
+            chosen.append(index)
+            if len(seen) == sentences_per_speaker:
+                break
+
+    for index in sorted(chosen):
+        highlights[speakers[speaker_ids[index]]].append(sentences[index])
+
+    return highlights
+
+
+def key_phrase_candidates(text):
+    """N-grams of a statement that neither start nor end with a stop word
+
+    Stop words stay inside phrases ("cost of living"), so every candidate is
+    text that actually occurs in the statement.
+    """
+    low, high = KEY_PHRASE_NGRAMS
+    candidates = []
+    for chunk in PHRASE_BREAK.split(text.lower()):
+        tokens = KEY_PHRASE_TOKEN.findall(chunk)
+        for start, first in enumerate(tokens):
+            if first in ENGLISH_STOP_WORDS:
+                continue
+            for size in range(low, min(high, len(tokens) - start) + 1):
+                last = tokens[start + size - 1]
+                if last not in ENGLISH_STOP_WORDS:
+                    candidates.append(" ".join(tokens[start:start + size]))
+    return candidates
+
+
+def extract_key_points(transcript_data, top_n=5):
+    """Extract the transcript's key phrases with the statements and speakers behind them
+
+    Phrases are scored by their summed TF-IDF weight over all statements, so the
+    cost grows with the transcript's size rather than with statement pairs.
+    """
+    texts = [entry['text'] for entry in transcript_data]
+    if not texts:
+        return []
+
+    # A key point should recur across statements; very short transcripts may have none that do
+    matrix = None
+    for min_df in (2, 1):
+        vectorizer = TfidfVectorizer(
+            analyzer=key_phrase_candidates,
+            min_df=min_df,
+            sublinear_tf=True,
+            dtype=np.float32
+        )
+        try:
+            matrix = vectorizer.fit_transform(texts)
+            break
+        except ValueError:
+            continue
+    if matrix is None:
+        return []
+
+    phrases = vectorizer.get_feature_names_out()
+    phrase_lengths = np.char.count(phrases.astype(str), ' ') + 1
+    scores = np.asarray(matrix.sum(axis=0)).ravel()
+    scores *= 1 + KEY_PHRASE_LENGTH_BOOST * (phrase_lengths - 1)
+
+    # Walk candidates best-first, skipping phrases nested in or overlapping one already chosen
+    chosen = []
+    chosen_tokens = []
+    for column in np.argsort(-scores, kind='stable'):
+        tokens = set(phrases[column].split()) - ENGLISH_STOP_WORDS
+        if any(
+            tokens <= other or other <= tokens or len(tokens & other) >= KEY_PHRASE_MAX_OVERLAP
+            for other in chosen_tokens
+        ):
+            continue
+        chosen.append(column)
+        chosen_tokens.append(tokens)
+        if len(chosen) == top_n:
+            break
+
+    by_phrase = matrix[:, chosen].tocsc()
+    key_points = []
+    for position, column in enumerate(chosen):
+        statement_ids = by_phrase.indices[by_phrase.indptr[position]:by_phrase.indptr[position + 1]]
+        speaker_mentions = {}
+        for statement_id in statement_ids:
+            speaker = transcript_data[statement_id]['speaker']
+            speaker_mentions[speaker] = speaker_mentions.get(speaker, 0) + 1
+        key_points.append({
+            "phrase": phrases[column],
+            "score": float(scores[column]),
+            "statements": len(statement_ids),
+            "speakers": sorted(speaker_mentions, key=speaker_mentions.get, reverse=True)
+        })
+
+    return key_points
+
+
+def condense_transcript(transcript_data, max_words):
+    """Shorten a transcript to its top-ranked sentences, kept in speaking order
+
+    Used to fit long debates into an abstractive model's input window.
+    Each sentence is prefixed with its speaker, and the prefix's words count
+    towards `max_words`. Sentences too long for the words left are skipped in
+    favour of shorter ones; when not even one fits (long unpunctuated
+    captions), the best sentence is cut to fit.
+    """
+    sentences, speaker_ids, speakers = split_sentences(transcript_data)
+    if not sentences:
+        words = " ".join(entry['text'] for entry in transcript_data).split()
+        return " ".join(words[:max_words])
+
+    scores = score_sentences(sentences, speaker_ids, len(speakers))
+    order = np.argsort(-scores, kind='stable').tolist()
+    # "Dr. Sarah Chen:" adds three words to each of her sentences
+    prefix_words = [len(speaker.split()) for speaker in speakers]
+    shortest = MIN_SENTENCE_WORDS + min(prefix_words)
+
+    chosen = []
+    seen = set()
+    used = 0
+    for index in order:
+        length = len(sentences[index].split()) + prefix_words[speaker_ids[index]]
+        if used + length > max_words:
+            continue
+        key = normalize_sentence(sentences[index])
+        if key in seen:
+            continue
+        seen.add(key)
+        chosen.append(index)
+        used += length
+        if max_words - used < shortest:
+            # No sentence is this short, so nothing else can fit
+            break
+
+    if not chosen:
+        best = order[0]
+        words = sentences[best].split()
+        room = max_words - prefix_words[speaker_ids[best]]
+        if room < 1:
+            return " ".join(words[:max_words])
+        return f"{speakers[speaker_ids[best]]}: {' '.join(words[:room])}"
+
+    return " ".join(f"{speakers[speaker_ids[index]]}: {sentences[index]}" for index in sorted(chosen))
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+DebatePulse - transcript replay
+Streams a saved transcript into the live ingest server at N x speed and
+reports latency from line arrival to scoring and to dashboard render
+"""
+
+import argparse
+import threading
+import time
+
+from ingest_server import DEFAULT_URL, fetch_events, fetch_stats, post_json
+from metrics import percentiles
+from transcript_parser import parse_seconds, parse_transcript
+
+
+def schedule_lines(transcript_data, speed, interval):
+    """Pair each statement with its send offset (seconds from the start of the replay)
+
+    Timed statements keep their spacing divided by `speed`; untimed ones are
+    sent `interval / speed` seconds after the previous statement.
+    """
+    schedule = []
+    first = None
+    offset = 0.0
+    for entry in transcript_data:
+        if entry["timestamp"]:
+            seconds = parse_seconds(entry["timestamp"])
+            if first is None:
+                first = seconds
+            offset = max(offset, (seconds - first) / speed)
+        elif schedule:
+            offset += interval / speed
+
+        prefix = f"[{entry['timestamp']}] " if entry["timestamp"] else ""
+        schedule.append((offset, f"{prefix}{entry['speaker']}: {entry['text']}"))
+    return schedule
+
+
+def replay(schedule, url=DEFAULT_URL):
+    """Send scheduled lines, retrying when the server pushes back; returns (sent, retries)"""
+    started = time.monotonic()
+    sent = 0
+    retries = 0
+    for offset, line in schedule:
+        delay = started + offset - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        while True:
+            status, _ = post_json(url, "/lines", {"lines": [line], "sent_at": time.time()})
+            if status != 429:
+                break
+            retries += 1
+            time.sleep(0.1)
+        sent += 1
+    return sent, retries
+
+
+def watch(url, since, expected, latencies, done):
+    """Subscribe to scored lines and record arrival -> scored latency"""
+    received = 0
+    while received < expected and not done.is_set():
+        payload = fetch_events(url, since, timeout=1.0)
+        now = time.time()
+        for event in payload["events"]:
+            latencies.append(now - event["received_at"])
+        received += len(payload["events"])
+        since = payload["last_seq"]
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Replay a saved transcript into the DebatePulse ingest server")
+    parser.add_argument("transcript", help="TXT, SRT or WebVTT transcript file")
+    parser.add_argument("--url", default=DEFAULT_URL, help="ingest server URL")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier (10 = 10x real time)")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between untimed lines at 1x")
+    args = parser.parse_args()
+
+    with open(args.transcript, encoding="utf-8") as transcript_file:
+        transcript_data = parse_transcript(transcript_file.read())
+    if not transcript_data:
+        print("❌ No statements found in the transcript")
+        return
+
+    schedule = schedule_lines(transcript_data, args.speed, args.interval)
+    since = fetch_events(args.url, 0)["last_seq"]
+
+    latencies = []
+    done = threading.Event()
+    watcher = threading.Thread(target=watch, args=(args.url, since, len(schedule), latencies, done), daemon=True)
+    watcher.start()
+
+    print(f"▶️ Replaying {len(schedule)} statements at {args.speed:g}x ({schedule[-1][0]:.1f}s)...")
+    started = time.monotonic()
+    sent, retries = replay(schedule, args.url)
+    watcher.join(timeout=30)
+    done.set()
+    elapsed = time.monotonic() - started
+
+    stats = fetch_stats(args.url)
+    print("=" * 50)
+    print(f"📤 Sent {sent} lines in {elapsed:.1f}s ({sent / elapsed:.1f} lines/s), {retries} backpressure retries")
+    print(f"📥 Scored lines seen by this client: {len(latencies)}")
+    for label, values in (("arrival -> client", percentiles(latencies)),
+                          ("arrival -> rendered", stats.get("arrival_to_rendered", {}))):
+        if values:
+            print(f"⏱️ {label:<20} " + "  ".join(f"{name} {value * 1000:.0f}ms" for name, value in values.items()))
+        else:
+            print(f"⏱️ {label:<20} no data (is a dashboard subscribed?)")
+    print(f"📦 Server batches: {stats['batches']} (mean size {stats['mean_batch_size']:.1f}), rejected lines: {stats['rejected']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+DebatePulse - latency-budget summarization
+Picks a summary strategy that fits a time budget and measures what it spent
+"""
+
+import threading
+import time
+
+from nlp_engine import condense_transcript, extract_speaker_highlights
+
+BART_MODEL = "facebook/bart-large-cnn"
+DISTILBART_MODEL = "sshleifer/distilbart-cnn-12-6"
+
+# Prior CPU throughput per model, refined by measurements:
+#   encode - input words per second, decode - output tokens per second per beam,
+#   load - seconds to load the model when it is not in memory yet
+MODEL_PROFILES = {
+    BART_MODEL: {"encode": 350.0, "decode": 14.0, "load": 12.0},
+    DISTILBART_MODEL: {"encode": 700.0, "decode": 28.0, "load": 6.0},
+}
+
+# Extractive ranking throughput prior (words per second)
+EXTRACTIVE_WORDS_PER_SECOND = 400_000.0
+
+# Abstractive candidates from best to cheapest: model, beams, input words.
+# 700 words is about BART's 1024-token input limit; shorter inputs are
+# condensed from the transcript's top-ranked sentences first.
+ABSTRACTIVE_OPTIONS = [
+    (BART_MODEL, 4, 700),
+    (BART_MODEL, 2, 700),
+    (DISTILBART_MODEL, 4, 700),
+    (DISTILBART_MODEL, 2, 500),
+    (DISTILBART_MODEL, 1, 350),
+    (DISTILBART_MODEL, 1, 200),
+]
+
+# Weight of the newest measurement in the running throughput estimate
+SMOOTHING = 0.3
+
+
+class ThroughputTracker:
+    """Running correction of the throughput priors from measured summary runs"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._slowdown = {}
+        self._extractive_rate = EXTRACTIVE_WORDS_PER_SECOND
+
+    def slowdown(self, model):
+        """Measured / predicted compute time for a model (1.0 until measured)"""
+        with self._lock:
+            return self._slowdown.get(model, 1.0)
+
+    def extractive_rate(self):
+        """Measured extractive throughput in words per second"""
+        with self._lock:
+            return self._extractive_rate
+
+    def record_abstractive(self, model, predicted_seconds, elapsed_seconds):
+        """Fold one abstractive run (against its prior prediction) into the model's slowdown factor"""
+        if predicted_seconds <= 0:
+            return
+        ratio = elapsed_seconds / predicted_seconds
+        with self._lock:
+            previous = self._slowdown.get(model)
+            self._slowdown[model] = ratio if previous is None else (
+                (1 - SMOOTHING) * previous + SMOOTHING * ratio
+            )
+
+    def record_extractive(self, words, elapsed_seconds):
+        """Fold one extractive run into the extractive throughput"""
+        if words <= 0 or elapsed_seconds <= 0:
+            return
+        rate = words / elapsed_seconds
+        with self._lock:
+            self._extractive_rate = (1 - SMOOTHING) * self._extractive_rate + SMOOTHING * rate
+
+
+def output_lengths(input_words):
+    """Summary max/min token lengths for an input size (150/50 at full size)"""
+    max_length = min(150, max(40, input_words // 4))
+    return max_length, min(50, max_length // 2)
+
+
+def prior_compute_seconds(model, num_beams, input_words):
+    """Compute seconds for one abstractive summary according to the model's prior profile"""
+    profile = MODEL_PROFILES[model]
+    max_length, _ = output_lengths(input_words)
+    return input_words / profile["encode"] + max_length * num_beams / profile["decode"]
+
+
+def estimate_abstractive_seconds(model, num_beams, input_words, tracker, loaded=True):
+    """Predicted seconds for one abstractive summary, corrected by measurements"""
+    seconds = prior_compute_seconds(model, num_beams, input_words) * tracker.slowdown(model)
+    if not loaded:
+        seconds += MODEL_PROFILES[model]["load"]
+    return seconds
+
+
+def plan_summary(transcript_data, budget_seconds, tracker, loaded_models=()):
+    """Choose the best summary strategy expected to finish within the budget
+
+    Returns a dict describing the plan: `strategy` ('abstractive' or
+    'extractive'), the model and generation settings for abstractive plans,
+    and the `estimated_seconds`.
+    """
+    total_words = sum(len(entry["text"].split()) for entry in transcript_data)
+    extractive_seconds = total_words / tracker.extractive_rate()
+
+    for model, num_beams, input_words in ABSTRACTIVE_OPTIONS:
+        input_words = min(input_words, total_words)
+        condensed = input_words < total_words
+        estimate = estimate_abstractive_seconds(
+            model, num_beams, input_words, tracker, loaded=model in loaded_models
+        )
+        if condensed:
+            estimate += extractive_seconds
+        if estimate <= budget_seconds:
+            max_length, min_length = output_lengths(input_words)
+            return {
+                "strategy": "abstractive",
+                "model": model,
+                "num_beams": num_beams,
+                "input_words": input_words,
+                "condensed": condensed,
+                "max_length": max_length,
+                "min_length": min_length,
+                "total_words": total_words,
+                "estimated_seconds": estimate,
+            }
+
+    return {
+        "strategy": "extractive",
+        "total_words": total_words,
+        "estimated_seconds": extractive_seconds,
+    }
+
+
+def run_summary_plan(plan, transcript_data, get_summarizer, tracker):
+    """Execute a summary plan and report the time spent
+
+    `get_summarizer(model)` must return a transformers summarization pipeline.
+    Returns (summary, report); the summary is plain text for abstractive plans
+    and a {speaker: [sentences]} dict for extractive ones.
+    """
+    started = time.perf_counter()
+
+    if plan["strategy"] == "extractive":
+        summary = extract_speaker_highlights(transcript_data)
+        elapsed = time.perf_counter() - started
+        tracker.record_extractive(plan["total_words"], elapsed)
+        return summary, {"elapsed_seconds": elapsed, "load_seconds": 0.0}
+
+    summarizer = get_summarizer(plan["model"])
+    loaded = time.perf_counter()
+
+    if plan["condensed"]:
+        text = condense_transcript(transcript_data, plan["input_words"])
+    else:
+        text = " ".join(entry["text"] for entry in transcript_data)
+
+    compute_started = time.perf_counter()
+    result = summarizer(
+        text,
+        max_length=plan["max_length"],
+        min_length=plan["min_length"],
+        num_beams=plan["num_beams"],
+        do_sample=False,
+        truncation=True
+    )
+    finished = time.perf_counter()
+
+    tracker.record_abstractive(
+        plan["model"],
+        prior_compute_seconds(plan["model"], plan["num_beams"], plan["input_words"]),
+        finished - compute_started
+    )
+    return result[0]["summary_text"], {
+        "elapsed_seconds": finished - started,
+        "load_seconds": loaded - started,
+    }
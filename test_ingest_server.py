@@ -0,0 +1,111 @@
+"""
+Tests for the DebatePulse live ingest server
+Run with: python -m pytest test_ingest_server.py
+"""
+
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from ingest_server import IngestPipeline, create_server, fetch_events, post_json
+
+
+@pytest.fixture
+def server_url():
+    server = create_server(IngestPipeline(max_wait=0.01), port=0)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def post_raw(url, path, body, content_type="application/json"):
+    """POST raw bytes; returns the response status"""
+    request = urllib.request.Request(f"{url}{path}", data=body, headers={"Content-Type": content_type}, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as error:
+        return error.code
+
+
+def wait_for_events(url, count):
+    events = []
+    while len(events) < count:
+        response = fetch_events(url, events[-1]["seq"] if events else 0, timeout=2)
+        assert response["events"], f"only {len(events)} of {count} events arrived"
+        events.extend(response["events"])
+    return events
+
+
+def test_every_statement_of_a_multiline_item_is_published(server_url):
+    assert post_json(server_url, "/lines", {"lines": "C: one\nD: two"}) == (202, {"accepted": 2})
+    assert post_json(server_url, "/lines", {"lines": ["E: three\n\nF: four"]}) == (202, {"accepted": 2})
+
+    events = wait_for_events(server_url, 4)
+    assert [(event["speaker"], event["text"]) for event in events] == [
+        ("C", "one"), ("D", "two"), ("E", "three"), ("F", "four")
+    ]
+
+
+def test_bare_timestamp_times_the_next_statement(server_url):
+    post_json(server_url, "/lines", {"lines": ["[00:10]", "A: opening", "more from A"]})
+
+    events = wait_for_events(server_url, 2)
+    assert [(event["speaker"], event["text"], event["timestamp"]) for event in events] == [
+        ("A", "opening", "00:10"), ("A", "more from A", "")
+    ]
+
+
+@pytest.mark.parametrize("path, payload", [
+    ("/lines", ["a list"]),
+    ("/lines", {"lines": 5}),
+    ("/lines", {"lines": ["ok", 7]}),
+    ("/lines", {"lines": ["ok"], "sent_at": "now"}),
+    ("/lines", {"lines": ["ok"], "sent_at": True}),
+    ("/ack", {"seq": "3"}),
+    ("/ack", {"seq": True}),
+    ("/ack", {"seq": 1, "rendered_at": "later"}),
+])
+def test_invalid_payloads_are_rejected(server_url, path, payload):
+    status, response = post_json(server_url, path, payload)
+    assert status == 400
+    assert "error" in response
+
+
+def test_malformed_bodies_are_rejected(server_url):
+    assert post_raw(server_url, "/lines", b"{not json") == 400
+    assert post_raw(server_url, "/lines", b"\xff\xfe", content_type="text/plain") == 400
+    assert post_raw(server_url, "/ack", b'{"seq": 1, "rendered_at": NaN}') == 400
+
+
+@pytest.mark.parametrize("query", ["since=abc", "timeout=soon", "timeout=nan", "timeout=inf"])
+def test_invalid_event_queries_are_rejected(server_url, query):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(f"{server_url}/events?{query}", timeout=5)
+    assert error.value.code == 400
+
+
+def test_worker_survives_a_failing_batch():
+    calls = []
+
+    def flaky_analyzer(texts, **options):
+        # The first batch gets output without labels, which fails while publishing it
+        calls.append(texts)
+        if len(calls) == 1:
+            return [{} for _ in texts]
+        return [{"label": "positive", "score": 1.0} for _ in texts]
+
+    pipeline = IngestPipeline(flaky_analyzer, max_wait=0.01)
+    pipeline.offer(["A: lost"])
+    while not pipeline.stats()["failed"]:
+        time.sleep(0.01)
+    pipeline.offer(["A: kept"])
+
+    events, _ = pipeline.events_since(0, timeout=2)
+    assert [(event["text"], event["sentiment"]) for event in events] == [("kept", "positive")]
+    assert pipeline.stats()["failed"] == 1
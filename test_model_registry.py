@@ -0,0 +1,240 @@
+"""
+Tests for the DebatePulse model registry and inference service
+Run with: python -m pytest test_model_registry.py
+"""
+
+import gc
+import threading
+import time
+import weakref
+
+import pytest
+
+from inference_service import InferenceService
+from model_registry import ModelBudgetError, ModelRegistry, effective_precision, resident_mb, settings_from_env
+from nlp_engine import score_sentiments
+
+
+class FakeModel:
+    """Stands in for a transformers pipeline"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batch_sizes = []
+
+    def __call__(self, inputs, batch_size=None, **options):
+        self.batch_sizes.append(batch_size)
+        if self.fail:
+            raise RuntimeError("model failed")
+        return [{"label": "positive", "score": 1.0} for _ in inputs]
+
+
+def tracking_loader(models, fail=False):
+    """Loader that keeps a weak reference to every model it builds"""
+    def load(precision):
+        model = FakeModel(fail)
+        models.append(weakref.ref(model))
+        return model
+    return load
+
+
+def test_unloaded_model_is_garbage_collected():
+    models = []
+    registry = ModelRegistry()
+    registry.register("sentiment", tracking_loader(models), 100)
+    service = InferenceService(registry)
+
+    client = service.client("sentiment")
+    assert client(["A good point."]) == [{"label": "positive", "score": 1.0}]
+    assert registry.unload("sentiment")
+    gc.collect()
+
+    assert not registry.is_loaded("sentiment")
+    assert models[0]() is None
+
+
+def test_model_is_collected_after_a_failed_batch():
+    models = []
+    registry = ModelRegistry()
+    registry.register("sentiment", tracking_loader(models, fail=True), 100)
+    service = InferenceService(registry)
+
+    future = service.submit("sentiment", ["A good point."])
+    with pytest.raises(RuntimeError):
+        future.result()
+    assert registry.unload("sentiment")
+    gc.collect()
+
+    assert models[0]() is None
+
+
+class BlockingModel:
+    """Records each call; the first call waits until released so requests pile up behind it"""
+
+    def __init__(self):
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, inputs, batch_size=None, **options):
+        self.calls.append((list(inputs), options))
+        self.started.set()
+        self.release.wait(5)
+        return [{"label": "positive", "score": 1.0} for _ in inputs]
+
+
+def test_service_coalesces_requests_with_the_same_options():
+    model = BlockingModel()
+    registry = ModelRegistry()
+    registry.register("summarizer", lambda precision: model, 100)
+    service = InferenceService(registry)
+
+    first = service.submit("summarizer", ["one"])
+    assert model.started.wait(5)
+    # These queue while the model is busy with the first request
+    second = service.submit("summarizer", ["two"])
+    third = service.submit("summarizer", ["three", "four"])
+    beams = service.submit("summarizer", ["five"], num_beams=2)
+    time.sleep(0.1)
+    model.release.set()
+
+    results = [future.result(5) for future in (first, second, third, beams)]
+    assert model.calls == [
+        (["one"], {}),
+        (["two", "three", "four"], {}),
+        (["five"], {"num_beams": 2}),
+    ]
+    assert [len(result.outputs) for result in results] == [1, 1, 2, 1]
+    assert (results[1].batch_requests, results[1].batch_inputs) == (2, 3)
+    assert (results[3].batch_requests, results[3].batch_inputs) == (1, 1)
+    # The queued requests waited for the first batch; their timings say so
+    assert results[1].queue_seconds >= 0.1 > results[0].queue_seconds
+    assert results[1].compute_seconds == results[2].compute_seconds
+    assert service.stats()["summarizer"]["batches"] == 3
+
+
+def test_large_request_runs_in_max_batch_chunks():
+    model = FakeModel()
+    registry = ModelRegistry()
+    registry.register("sentiment", lambda precision: model, 100)
+    service = InferenceService(registry, max_batch=32)
+
+    outputs = score_sentiments(["A good point."] * 5000, service.client("sentiment"), batch_size=5000)
+
+    assert outputs == ["positive"] * 5000
+    assert max(model.batch_sizes) == 32
+
+
+def test_budget_evicts_least_recently_used_model():
+    models = []
+    registry = ModelRegistry(budget_mb=1000)
+    for name in ("a", "b", "c"):
+        registry.register(name, tracking_loader(models), 400)
+
+    registry.load("a")
+    registry.load("b")
+    registry.load("a")
+    registry.load("c")
+    gc.collect()
+
+    assert registry.loaded_models() == {"a", "c"}
+    assert registry.stats()["b"]["evictions"] == 1
+    assert models[1]() is None
+
+
+def test_model_larger_than_budget_is_rejected():
+    registry = ModelRegistry(budget_mb=100)
+    registry.register("large", tracking_loader([]), 500)
+
+    with pytest.raises(ModelBudgetError):
+        registry.load("large")
+
+
+def test_unsupported_precision_falls_back_to_float32(monkeypatch):
+    assert effective_precision("float16", cuda_available=False) == "float32"
+    assert effective_precision("int8", cuda_available=True) == "float32"
+    assert effective_precision("bfloat16", cuda_available=False) == "bfloat16"
+
+    monkeypatch.setenv("DEBATEPULSE_MODEL_PRECISION", "float16")
+    registry = ModelRegistry(**settings_from_env(cuda_available=False))
+    registry.register("summarizer", tracking_loader([]), 1000)
+    # The budget reserves the full float32 size, since that is what gets loaded
+    assert registry.precision == "float32"
+    assert registry.stats()["summarizer"]["size_mb"] == 1000
+
+
+class FakeTensor:
+    """Just enough of a torch tensor for resident_mb()"""
+
+    def __init__(self, pointer, mb, element_size=4):
+        self.pointer = pointer
+        self.elements = mb * 1024 * 1024 // element_size
+        self.size = element_size
+
+    def data_ptr(self):
+        return self.pointer
+
+    def numel(self):
+        return self.elements
+
+    def element_size(self):
+        return self.size
+
+
+class FakeModule:
+    def __init__(self, parameters=(), buffers=(), children=()):
+        self._parameters = list(parameters)
+        self._buffers = list(buffers)
+        self._children = list(children)
+
+    def parameters(self):
+        return iter(self._parameters + [p for child in self._children for p in child._parameters])
+
+    def buffers(self):
+        return iter(self._buffers)
+
+    def modules(self):
+        return iter([self] + self._children)
+
+
+class FakeQuantizedLinear(FakeModule):
+    """Dynamic-quantized Linear: int8 weights packed outside parameters()"""
+
+    def __init__(self, weight, bias, readable=True):
+        super().__init__()
+        self._packed_params = object()
+        self._weight = weight
+        self._bias = bias
+        self.readable = readable
+
+    def weight(self):
+        if not self.readable:
+            raise RuntimeError("cannot unpack")
+        return self._weight
+
+    def bias(self):
+        return self._bias
+
+
+class FakePipeline:
+    def __init__(self, model):
+        self.model = model
+
+
+def test_tied_weights_are_counted_once():
+    shared = FakeTensor(1, 196)
+    # state_dict() would list the shared embedding under four names
+    model = FakeModule(parameters=[shared, FakeTensor(2, 100)], buffers=[FakeTensor(1, 196), FakeTensor(3, 4)])
+    assert resident_mb(FakePipeline(model)) == 300
+
+
+def test_quantized_linear_weights_are_counted():
+    layer = FakeQuantizedLinear(FakeTensor(10, 50, element_size=1), FakeTensor(11, 1))
+    # The packed-params holder is a module too, but without weight()
+    holder = FakeModule()
+    holder._packed_params = object()
+    model = FakeModule(parameters=[FakeTensor(1, 20)], children=[layer, holder])
+    assert resident_mb(FakePipeline(model)) == 71
+
+    unreadable = FakeQuantizedLinear(FakeTensor(10, 50, element_size=1), None, readable=False)
+    assert resident_mb(FakePipeline(FakeModule(children=[unreadable]))) is None
@@ -0,0 +1,94 @@
+"""
+Tests for the DebatePulse transcript parser
+Run with: python -m pytest test_transcript_parser.py
+"""
+
+from transcript_parser import format_timestamp, parse_seconds, parse_transcript
+
+
+def speakers_and_texts(transcript_data):
+    return [(entry["speaker"], entry["text"]) for entry in transcript_data]
+
+
+def test_timestamped_lines():
+    parsed = parse_transcript("[00:15] Dr. Sarah Chen: Opening.\n[1:02:03.500] Prof. Rodriguez: Reply.")
+    assert speakers_and_texts(parsed) == [("Dr. Sarah Chen", "Opening."), ("Prof. Rodriguez", "Reply.")]
+    assert [entry["timestamp"] for entry in parsed] == ["00:15", "1:02:03"]
+
+
+def test_speaker_without_space_after_colon():
+    parsed = parse_transcript("A: hello\nB:no space")
+    assert speakers_and_texts(parsed) == [("A", "hello"), ("B", "no space")]
+
+
+def test_times_in_text_are_not_speakers():
+    parsed = parse_transcript("B: at 10:30 we go\ncontinued line\nA:no space")
+    assert speakers_and_texts(parsed) == [("B", "at 10:30 we go continued line"), ("A", "no space")]
+
+
+def test_phrase_before_colon_is_not_a_speaker():
+    parsed = parse_transcript("A: first part\nthe answer is simple: we act now\nDr. van Dyke: Agreed.")
+    assert speakers_and_texts(parsed) == [
+        ("A", "first part the answer is simple: we act now"),
+        ("Dr. van Dyke", "Agreed."),
+    ]
+
+
+def test_line_without_speaker_continues_statement():
+    parsed = parse_transcript("A: first part\nsecond part\nthird part\nB: reply")
+    assert speakers_and_texts(parsed) == [("A", "first part second part third part"), ("B", "reply")]
+
+
+def test_bare_timestamp_times_the_next_statement():
+    parsed = parse_transcript("[00:15]\nDr. Chen: Opening.\n[00:20]\nMore from her.")
+    assert speakers_and_texts(parsed) == [("Dr. Chen", "Opening."), ("Dr. Chen", "More from her.")]
+    assert [entry["timestamp"] for entry in parsed] == ["00:15", "00:20"]
+
+
+def test_srt_cues():
+    text = (
+        "1\n00:00:01,000 --> 00:00:04,000\n>> Dr. Chen: The evidence is clear.\n\n"
+        "2\n01:02:03,000 --> 01:02:05,000\nWe must act\non climate now.\n"
+    )
+    parsed = parse_transcript(text)
+    assert speakers_and_texts(parsed) == [
+        ("Dr. Chen", "The evidence is clear."),
+        ("Dr. Chen", "We must act on climate now."),
+    ]
+    assert [entry["timestamp"] for entry in parsed] == ["00:01", "1:02:03"]
+
+
+def test_webvtt_voice_tags():
+    text = "WEBVTT\n\n00:05.000 --> 00:07.000\n<v Prof. Rodriguez>I disagree.</v>\n"
+    assert speakers_and_texts(parse_transcript(text)) == [("Prof. Rodriguez", "I disagree.")]
+
+
+def test_timestamp_round_trip():
+    for stamp, expected in (("00:15", "00:15"), ("01:02:03,500", "1:02:03"), ("75:00", "1:15:00")):
+        assert format_timestamp(parse_seconds(stamp)) == expected
+
+
+def test_caption_phrase_with_colon_is_not_a_speaker():
+    text = (
+        "1\n00:00:01,000 --> 00:00:03,000\nThe answer is simple: we act now.\n\n"
+        "2\n00:00:04,000 --> 00:00:06,000\nAnd we act together.\n"
+    )
+    parsed = parse_transcript(text)
+    assert speakers_and_texts(parsed) == [
+        ("Unknown", "The answer is simple: we act now."),
+        ("Unknown", "And we act together."),
+    ]
+
+
+def test_bare_caption_name_labels_only_its_cue():
+    text = (
+        "1\n00:00:01,000 --> 00:00:03,000\n>> Moderator: Welcome.\n\n"
+        "2\n00:00:04,000 --> 00:00:06,000\nDr. Sarah Chen: Thank you.\n\n"
+        "3\n00:00:07,000 --> 00:00:09,000\nLet us begin.\n"
+    )
+    parsed = parse_transcript(text)
+    assert speakers_and_texts(parsed) == [
+        ("Moderator", "Welcome."),
+        ("Dr. Sarah Chen", "Thank you."),
+        ("Moderator", "Let us begin."),
+    ]
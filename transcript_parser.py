@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+DebatePulse - transcript parser
+Reads SRT, WebVTT and line-based ([HH:MM:SS] Speaker: text) transcripts
+
+Run `python transcript_parser.py` to benchmark parsing speed.
+"""
+
+import argparse
+import re
+import time
+
+# [00:15] / [1:02:03] / [01:02:03.500] - hours and milliseconds are optional
+STAMP = r'(?:\d{1,2}:)?\d{1,2}:\d{2}(?:[.,]\d{1,3})?'
+
+# One line of a line-based transcript: optional [timestamp] (milliseconds are
+# dropped from the captured group), optional speaker, then the text, which is
+# empty for a bare [timestamp] line. The speaker's colon must be followed by
+# whitespace or a letter ("A:text"), so times inside the text ("at 10:30")
+# are never read as speakers.
+LINE = re.compile(
+    r'^[ \t]*'
+    r'(?:\[((?:\d\d?:)?\d\d?:\d\d)(?:[.,]\d+)?\][ \t]*)?'
+    r'(?:([^:\[\]\n]{1,50}):(?:[ \t]+|(?=[^\W\d_])))?'
+    r'([^\n]*)',
+    re.M
+)
+
+# One SRT/WebVTT cue: the timing line, then text lines up to the next blank line.
+# Cue numbers / identifiers before the timing line are skipped by the search.
+# The start time's hours, minutes and seconds are captured separately.
+CUE = re.compile(
+    r'^[ \t]*(?:(\d{1,2}):)?(\d{1,2}):(\d{2})(?:[.,]\d{1,3})?[ \t]+-->[ \t]+' + STAMP + r'[^\n]*\n'
+    r'((?:[ \t]*\S[^\n]*(?:\n|\Z))+)',
+    re.M
+)
+
+ARROW = re.compile(r'^[ \t]*' + STAMP + r'[ \t]+-->', re.M)
+
+# Speaker markers inside caption text. "<v Name>", ">> Name:" and "- Name:"
+# are explicit and carry over to later unmarked cues; a bare "Name:" only
+# counts when it looks like a name and labels just its own cue.
+VOICE_TAG = re.compile(r'<v(?:\.[^\s>]*)?\s+([^>]+)>')
+MARKED_SPEAKER = re.compile(r'^(?:>>|-)[ \t]*([^:<>\[\]\n]{1,50}?):[ \t]+')
+NAMED_SPEAKER = re.compile(r"^([^\W_][\w.'-]*(?:[ \t]+[^\W_][\w.'-]*){0,3}):[ \t]+")
+MARKUP = re.compile(r'<[^>]*>')
+
+# Lowercase words allowed inside a bare "Name:" ("Ludwig van Beethoven")
+NAME_PARTICLES = {"van", "von", "de", "da", "del", "der", "di", "la", "le", "bin", "al"}
+
+UNKNOWN_SPEAKER = "Unknown"
+
+
+def detect_format(text):
+    """Return 'webvtt', 'srt' or 'lines' for a transcript"""
+    head = text.lstrip('\ufeff \t\r\n')[:4096]
+    if head.startswith('WEBVTT'):
+        return 'webvtt'
+    if ARROW.search(head):
+        return 'srt'
+    return 'lines'
+
+
+def parse_seconds(stamp):
+    """Convert HH:MM:SS.mmm, MM:SS or HH:MM:SS,mmm to seconds"""
+    parts = stamp.replace(',', '.').split(':')
+    seconds = float(parts[-1]) + int(parts[-2]) * 60
+    if len(parts) == 3:
+        seconds += int(parts[0]) * 3600
+    return seconds
+
+
+def format_timestamp(seconds):
+    """Format seconds as MM:SS, or H:MM:SS from an hour on"""
+    whole = int(seconds)
+    hours, rest = divmod(whole, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+
+def _looks_like_name(label):
+    """Whether a bare "label:" prefix is shaped like a speaker name (capitalized words)"""
+    words = label.split()
+    return bool(words) and words[0][0].isupper() and all(
+        word[0].isupper() or word[0].isdigit() or word in NAME_PARTICLES for word in words
+    )
+
+
+def _cue_timestamp(hours, minutes, seconds):
+    """format_timestamp() of a cue start from its matched fields, without converting to seconds"""
+    if len(minutes) == 1:
+        minutes = '0' + minutes
+    if minutes >= '60' or seconds >= '60':
+        return format_timestamp(int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds))
+    hours = hours.lstrip('0')
+    return f"{hours}:{minutes}:{seconds}" if hours else f"{minutes}:{seconds}"
+
+
+def parse_transcript(text, transcript_format=None):
+    """Parse transcript text into structured format
+
+    The format is detected from the text unless given. Lines or cues without a
+    speaker continue the previous speaker, and untimed lines get an empty
+    timestamp; `parse_seconds(entry["timestamp"])` gives a timed entry's offset.
+    """
+    text = text.replace('\r\n', '\n')
+    transcript_format = transcript_format or detect_format(text)
+    if transcript_format in ('srt', 'webvtt'):
+        return _parse_cues(text)
+    return _parse_lines(text)
+
+
+def _parse_lines(text):
+    """Parse `[timestamp] Speaker: text` / `Speaker: text` lines
+
+    On an untimed line the prefix only counts as a speaker when it is shaped
+    like a name, so "the answer is simple: we act now" stays text (with one
+    space after its colon).
+    """
+    parsed_data = []
+    append = parsed_data.append
+    last = None
+    # Pieces of the last statement's text, once a continuation line arrives
+    continued = None
+    pending_stamp = ''
+
+    for stamp, speaker, line in LINE.findall(text):
+        if not line:
+            # A timestamp on its own line times the statement that follows
+            if stamp:
+                pending_stamp = stamp
+            continue
+        if pending_stamp:
+            stamp = stamp or pending_stamp
+            pending_stamp = ''
+
+        if speaker:
+            if stamp or _looks_like_name(speaker):
+                speaker = speaker.strip()
+            else:
+                # A phrase before a colon in running text, not a speaker
+                line = f"{speaker}: {line}"
+                speaker = ''
+
+        if not speaker:
+            if stamp:
+                # Timed line without a speaker: the previous speaker carries on
+                speaker = last["speaker"] if last is not None else UNKNOWN_SPEAKER
+            else:
+                # Untimed line without a speaker continues the previous statement
+                if last is not None:
+                    if continued is None:
+                        continued = [last["text"]]
+                    continued.append(line)
+                continue
+
+        if continued is not None:
+            last["text"] = " ".join(continued)
+            continued = None
+
+        last = {
+            "speaker": speaker,
+            "text": line,
+            "timestamp": stamp,
+            "sentiment": "neutral"  # Will be updated by sentiment analysis
+        }
+        append(last)
+
+    if continued is not None:
+        last["text"] = " ".join(continued)
+
+    return parsed_data
+
+
+def _parse_cues(text):
+    """Parse SRT or WebVTT cues, joining multi-line cue text"""
+    parsed_data = []
+    # Last explicitly marked speaker; unmarked cues are attributed to them
+    speaker = UNKNOWN_SPEAKER
+
+    for hours, minutes, seconds, body in CUE.findall(text):
+        body = body.strip()
+        if '\n' in body:
+            body = ' '.join(body.split())
+
+        if '<' in body:
+            voice = VOICE_TAG.search(body)
+            if voice:
+                speaker = voice.group(1).strip()
+            body = MARKUP.sub('', body).strip()
+
+        cue_speaker = speaker
+        marked = MARKED_SPEAKER.match(body)
+        if marked:
+            speaker = cue_speaker = marked.group(1).strip()
+            body = body[marked.end():]
+        else:
+            if body.startswith('>>'):
+                body = body[2:].lstrip()
+            named = NAMED_SPEAKER.match(body)
+            if named and _looks_like_name(named.group(1)):
+                cue_speaker = named.group(1)
+                body = body[named.end():]
+
+        if not body:
+            continue
+
+        parsed_data.append({
+            "speaker": cue_speaker,
+            "text": body,
+            "timestamp": _cue_timestamp(hours, minutes, seconds),
+            "sentiment": "neutral"
+        })
+
+    return parsed_data
+
+
+def _sample_text(transcript_format, n_lines):
+    """Build a synthetic transcript of roughly n_lines lines"""
+    speakers = ["Dr. Sarah Chen", "Prof. Michael Rodriguez", "Moderator"]
+    sentence = "We meet again at 10:30 to discuss the economic cost of climate action."
+    if transcript_format == 'lines':
+        return "\n".join(
+            f"[{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}] {speakers[i % 3]}: {sentence}"
+            for i in range(n_lines)
+        )
+
+    separator = '.' if transcript_format == 'webvtt' else ','
+    cues = []
+    for i in range(n_lines // 5):
+        stamp = f"{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}"
+        start = f"{stamp}{separator}000"
+        end = f"{stamp}{separator}900"
+        cues.append(f"{i + 1}\n{start} --> {end}\n{speakers[i % 3]}: {sentence}\n{sentence}\n")
+    header = "WEBVTT\n\n" if transcript_format == 'webvtt' else ""
+    return header + "\n".join(cues)
+
+
+def benchmark(n_lines=1_000_000, repeats=3):
+    """Measure parsing throughput in input lines per second for each format"""
+    results = {}
+    for transcript_format in ('lines', 'srt', 'webvtt'):
+        text = _sample_text(transcript_format, n_lines)
+        line_count = text.count('\n') + 1
+        best = float('inf')
+        for _ in range(repeats):
+            started = time.perf_counter()
+            parse_transcript(text)
+            best = min(best, time.perf_counter() - started)
+        results[transcript_format] = line_count / best
+    return results
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark the DebatePulse transcript parser")
+    parser.add_argument("--lines", type=int, default=1_000_000, help="input lines per format")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per format (best is reported)")
+    args = parser.parse_args()
+
+    print(f"⏱️ Parsing {args.lines:,} lines per format...")
+    for transcript_format, lines_per_second in benchmark(args.lines, args.repeats).items():
+        print(f"   {transcript_format:<7} {lines_per_second:>12,.0f} lines/sec")
+
+if __name__ == "__main__":
+    main()